@@ -0,0 +1,441 @@
+"""VoyageIQ HTTP API.
+
+Asyncio front-end around utils/analysis.py for the booking frontend. CPU-bound
+planning runs in a process pool and identical in-flight requests are coalesced
+onto a single computation.
+
+Run: python api_server.py --port 8080 --workers 4 [--shared-catalog] [--warmup [PATH]]
+
+With --shared-catalog the catalogue is published once into shared memory and
+the (spawned) workers attach to it instead of each loading their own copy.
+With --warmup every worker pre-builds its per-city caches on start (loading
+them from PATH when it holds artefacts for the same catalogue); /ready answers
+503 until all workers are up and warm.
+"""
+import argparse
+import asyncio
+import json
+import os
+import math
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from utils.analysis import (
+    calculate_detailed_budget,
+    calculate_college_group_costs,
+    estimate_risk_factors,
+    generate_itinerary,
+    generate_multi_city_itinerary,
+    generate_itinerary_alternatives,
+    inject_meal_slots,
+    schedule_itinerary,
+    calculate_experience_score,
+    calculate_time_efficiency,
+    calculate_risk_score,
+    calculate_overall_score,
+    calculate_risk_indicators,
+    simulate_budget_risk,
+    MC_MAX_DRAWS,
+)
+from utils.shared_catalog import publish_catalogue
+from utils import warmup
+
+MAX_BODY_BYTES = 1 << 20
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# --- WORKER JOBS (run inside the process pool) ---
+WORKER_WARMUP = {}
+
+def init_worker(warm, path):
+    # Pool initializer: a worker takes jobs only once its caches are built or loaded
+    start = time.perf_counter()
+    summary = warmup.warm_start(path) if warm else {"source": None, "artefacts": 0}
+    WORKER_WARMUP.update(source=summary["source"], artefacts=summary["artefacts"], ms=round((time.perf_counter() - start) * 1000, 1))
+
+def job_ready(params=None):
+    return {"pid": os.getpid(), **WORKER_WARMUP}
+
+def job_itinerary(params):
+    interests = params.get("interests", [])
+    pace = params.get("pace", "Moderate")
+    days = int(params["days"])
+    group_type = params.get("group_type", "Solo")
+    if "destinations" in params:
+        itinerary = generate_multi_city_itinerary(params["destinations"], days, interests, pace, group_type)
+    else:
+        itinerary = generate_itinerary(params["destination"], interests, pace, days, group_type)
+    if params.get("schedule", False):
+        itinerary = schedule_itinerary(itinerary)
+    elif params.get("meals", True):
+        itinerary = inject_meal_slots(itinerary)
+    return {"itinerary": itinerary}
+
+def job_alternatives(params):
+    alternatives = generate_itinerary_alternatives(
+        params["destination"], params.get("interests", []), params.get("pace", "Moderate"), int(params["days"]),
+        params.get("group_type", "Solo"), k=int(params.get("k", 3)),
+        budget_score=params.get("budget_score", 100), risk_score=params.get("risk_score", 100)
+    )
+    return {"alternatives": alternatives}
+
+def job_budget(params):
+    group_type = params.get("group_type", "Solo")
+    if group_type == "College Group":
+        budget_data = calculate_college_group_costs(
+            int(params["students"]), int(params["staff"]), int(params.get("drivers", 0)), int(params["days"]),
+            params["travel_type"], params["month"], int(params["activity_count"]), params["budget"], params["destination"]
+        )
+    else:
+        budget_data = calculate_detailed_budget(
+            params["budget"], params["travel_type"], int(params["days"]), params["month"],
+            int(params["activity_count"]), group_type, params["destination"]
+        )
+    if params.get("simulate", False):
+        budget_data["risk"] = simulate_budget_risk(budget_data, params["budget"], params["destination"], params["month"],
+                                                   int(params["activity_count"]), draws=int(params.get("draws", 5000)))
+    return budget_data
+
+def job_score(params):
+    itinerary = params["itinerary"]
+    interests = params.get("interests", [])
+    group_type = params.get("group_type", "Solo")
+    destination = params["destination"]
+    month = params["month"]
+    budget_data = params.get("budget_data") or job_budget(dict(params, activity_count=sum(
+        len([a for a in d['activities'] if not a.get('is_meal')]) for d in itinerary
+    )))
+
+    risks = estimate_risk_factors(destination, month)
+    exp_score, exp_status, _ = calculate_experience_score(itinerary, interests, destination, group_type)
+    time_score, time_status, _, avg_h = calculate_time_efficiency(itinerary, group_type)
+    risk_score = calculate_risk_score(risks)
+    overall = calculate_overall_score(budget_data['score'], exp_score, time_score, risk_score)
+    indicators = calculate_risk_indicators(
+        params["budget"], budget_data, month, itinerary, avg_h, group_type,
+        params.get("pace", "Moderate"), int(params.get("students", 0)), int(params.get("staff", 0))
+    )
+    return {
+        "overall": overall,
+        "budget": budget_data['score'],
+        "experience": {"score": exp_score, "status": exp_status},
+        "time_efficiency": {"score": time_score, "status": time_status, "avg_transit_hours": avg_h},
+        "risk": {"score": risk_score, "factors": risks},
+        "indicators": indicators,
+    }
+
+ROUTES = {
+    "/itinerary": job_itinerary,
+    "/alternatives": job_alternatives,
+    "/budget": job_budget,
+    "/score": job_score,
+}
+
+# --- REQUEST VALIDATION (event loop, before a job reaches the pool) ---
+# Bounds keep one request from holding a worker: days, k and the city list drive the planning loops
+MAX_TRIP_DAYS = 30
+MAX_DESTINATIONS = 10
+MAX_ALTERNATIVES = 10
+MAX_GROUP_SIZE = 1000
+MAX_ACTIVITY_COUNT = 200
+MAX_SLOTS_PER_DAY = 20
+MAX_NAME_CHARS = 100
+MAX_INTERESTS = 20
+TRAVEL_TYPES = ("Budget", "Standard", "Luxury")
+
+class BadRequest(ValueError):
+    # Client input a job can't run on; the message is returned in the 400 body
+    pass
+
+def _int(params, key, low, high, default=None):
+    if key not in params and default is not None:
+        return default
+    if key not in params:
+        raise BadRequest(f"'{key}' is required")
+    value = params[key]
+    try:
+        if isinstance(value, bool): raise TypeError
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise BadRequest(f"'{key}' must be an integer")
+    if not low <= number <= high:
+        raise BadRequest(f"'{key}' must be between {low} and {high}")
+    return number
+
+def _number(params, key):
+    value = params.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise BadRequest(f"'{key}' must be a number")
+    return value
+
+def _text(params, key, default=None):
+    value = params.get(key, default)
+    if not isinstance(value, str) or not value.strip() or len(value) > MAX_NAME_CHARS:
+        raise BadRequest(f"'{key}' must be a non-empty string of at most {MAX_NAME_CHARS} characters")
+    return value
+
+def _common(params):
+    interests = params.get("interests", [])
+    if not isinstance(interests, list) or len(interests) > MAX_INTERESTS or not all(isinstance(i, str) for i in interests):
+        raise BadRequest(f"'interests' must be a list of at most {MAX_INTERESTS} strings")
+    _text(params, "pace", "Moderate")
+    _text(params, "group_type", "Solo")
+
+def check_itinerary(params):
+    _common(params)
+    _int(params, "days", 1, MAX_TRIP_DAYS)
+    if "destinations" in params:
+        destinations = params["destinations"]
+        if (not isinstance(destinations, list) or not 1 <= len(destinations) <= MAX_DESTINATIONS
+                or not all(isinstance(d, str) and d.strip() and len(d) <= MAX_NAME_CHARS for d in destinations)):
+            raise BadRequest(f"'destinations' must list 1 to {MAX_DESTINATIONS} place names")
+    else:
+        _text(params, "destination")
+
+def check_alternatives(params):
+    _common(params)
+    _text(params, "destination")
+    _int(params, "days", 1, MAX_TRIP_DAYS)
+    _int(params, "k", 1, MAX_ALTERNATIVES, default=3)
+    for key in ("budget_score", "risk_score"):
+        if key in params: _number(params, key)
+
+def check_budget(params, with_count=True):
+    _text(params, "destination")
+    _text(params, "month")
+    _int(params, "days", 1, MAX_TRIP_DAYS)
+    _number(params, "budget")
+    if params.get("travel_type") not in TRAVEL_TYPES:
+        raise BadRequest(f"'travel_type' must be one of {', '.join(TRAVEL_TYPES)}")
+    if with_count:
+        _int(params, "activity_count", 0, MAX_ACTIVITY_COUNT)
+    if params.get("simulate", False):
+        _int(params, "draws", 1, MC_MAX_DRAWS, default=5000)
+    if _text(params, "group_type", "Solo") == "College Group":
+        students = _int(params, "students", 1, MAX_GROUP_SIZE)
+        staff = _int(params, "staff", 0, MAX_GROUP_SIZE)
+        drivers = _int(params, "drivers", 0, MAX_GROUP_SIZE, default=0)
+        if students + staff + drivers > MAX_GROUP_SIZE:
+            raise BadRequest(f"A group can have at most {MAX_GROUP_SIZE} people")
+
+def check_score(params):
+    _common(params)
+    _text(params, "destination")
+    _text(params, "month")
+    _number(params, "budget")
+    itinerary = params.get("itinerary")
+    if not isinstance(itinerary, list) or not 1 <= len(itinerary) <= MAX_TRIP_DAYS:
+        raise BadRequest(f"'itinerary' must list 1 to {MAX_TRIP_DAYS} days")
+    for day in itinerary:
+        slots = day.get("activities") if isinstance(day, dict) else None
+        if not isinstance(slots, list) or len(slots) > MAX_SLOTS_PER_DAY:
+            raise BadRequest(f"Every itinerary day needs an 'activities' list of at most {MAX_SLOTS_PER_DAY} slots")
+        for slot in slots:
+            if not isinstance(slot, dict) or not isinstance(slot.get("activity"), str):
+                raise BadRequest("Every slot needs an 'activity' name")
+            if not slot.get("is_meal"):
+                _number(slot, "lat")
+                _number(slot, "lon")
+    budget_data = params.get("budget_data")
+    if budget_data:
+        if not isinstance(budget_data, dict):
+            raise BadRequest("'budget_data' must be an object")
+        _number(budget_data, "score")
+        for key in ("total_estimated", "per_student_cost"):
+            if key in budget_data: _number(budget_data, key)
+    else:
+        check_budget(params, with_count=False)
+    _int(params, "students", 0, MAX_GROUP_SIZE, default=0)
+    _int(params, "staff", 0, MAX_GROUP_SIZE, default=0)
+
+CHECKS = {
+    "/itinerary": check_itinerary,
+    "/alternatives": check_alternatives,
+    "/budget": check_budget,
+    "/score": check_score,
+}
+
+def _json_default(obj):
+    # numpy scalars leak out of DataFrame records
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(payload):
+    return json.dumps(payload, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+# --- SERVER ---
+class APIServer:
+    def __init__(self, workers=None, shared_catalog=False, warm=False, warm_path=None):
+        self.catalog, mp_context = None, None
+        if shared_catalog:
+            # Spawned workers import utils.analysis fresh and attach via the inherited environment
+            self.catalog = publish_catalogue()
+            os.environ["VOYAGEIQ_SHARED_CATALOG"] = self.catalog.name
+            mp_context = get_context("spawn")
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                                        initializer=init_worker, initargs=(warm, warm_path))
+        self.warm = warm
+        self.workers_ready = {}
+        self.ready, self.ready_error = False, None
+        self.inflight = {}
+        self.stats = {"requests": 0, "coalesced": 0, "errors": 0}
+
+    async def dispatch(self, path, params):
+        job = ROUTES[path]
+        # Identical bodies share one worker computation while it is in flight
+        key = (path, json.dumps(params, sort_keys=True, default=_json_default))
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, job, params)
+        self.inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    async def wait_ready(self):
+        # Keep probing until every worker process has answered, i.e. finished its initializer.
+        # A worker still warming takes no jobs, so early rounds are served by the ones already up.
+        loop = asyncio.get_running_loop()
+        workers = self.pool._max_workers
+        try:
+            while len(self.workers_ready) < workers:
+                replies = await asyncio.gather(*(loop.run_in_executor(self.pool, job_ready) for _ in range(workers)))
+                for reply in replies:
+                    self.workers_ready[reply["pid"]] = reply
+                if len(self.workers_ready) < workers:
+                    await asyncio.sleep(0.05)
+            self.ready = True
+        except Exception as e:  # e.g. BrokenProcessPool from a failing initializer
+            self.ready_error = f"{type(e).__name__}: {e}"
+
+    async def handle_request(self, method, path, body):
+        if path == "/healthz":
+            return 200, {"status": "ok", **self.stats, "inflight": len(self.inflight), "shared_catalog": self.catalog.name if self.catalog else None}
+        if path == "/ready":
+            payload = {"ready": self.ready, "warmup": self.warm, "workers": self.pool._max_workers,
+                       "workers_ready": len(self.workers_ready), "worker_warmup": list(self.workers_ready.values())}
+            if self.ready_error:
+                payload["error"] = self.ready_error
+            return (200 if self.ready else 503), payload
+        if path not in ROUTES:
+            return 404, {"error": f"Unknown endpoint {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST with a JSON body"}
+        try:
+            params = json.loads(body or b"{}")
+            if not isinstance(params, dict):
+                raise ValueError("Body must be a JSON object")
+        except ValueError as e:
+            return 400, {"error": f"Invalid JSON: {e}"}
+        try:
+            CHECKS[path](params)
+        except BadRequest as e:
+            return 400, {"error": f"Invalid parameters: {e}"}
+        return 200, await self.dispatch(path, params)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # Can't find the end of the body, so the connection can't be reused
+                    await self.respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "Body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                path = target.split("?", 1)[0]
+                self.stats["requests"] += 1
+                try:
+                    status, payload = await self.handle_request(method.upper(), path, body)
+                except Exception:
+                    # Validated input that still fails is a server fault: log it, keep the details out of the reply
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Internal server error"}
+                if status >= 400:
+                    self.stats["errors"] += 1
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive=True):
+        data = encode_json(payload)
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"VoyageIQ API listening on http://{host}:{port} ({self.pool._max_workers} workers)")
+        ready_task = asyncio.create_task(self.wait_ready())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            ready_task.cancel()
+            self.pool.shutdown(cancel_futures=True)
+            if self.catalog is not None:
+                self.catalog.close()
+                self.catalog.unlink()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VoyageIQ async API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shared-catalog", action="store_true", help="Share one catalogue copy between workers")
+    parser.add_argument("--warmup", nargs="?", const="", default=None, metavar="PATH",
+                        help="Pre-build per-city caches in every worker, persisting them to PATH if given "
+                             f"(default: ${warmup.WARMUP_ENV})")
+    args = parser.parse_args()
+    if args.warmup is None:
+        warm, warm_path = warmup.warmup_path_from_env()
+    else:
+        warm, warm_path = True, args.warmup or None
+    # Treat SIGTERM like Ctrl-C so the pool and shared catalogue are cleaned up
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(APIServer(args.workers, args.shared_catalog, warm, warm_path).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
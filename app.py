@@ -3,21 +3,9 @@ import pandas as pd
 import os
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.analysis import (
-    calculate_detailed_budget, 
-    estimate_risk_factors, 
-    generate_itinerary, 
-    calculate_experience_score, 
-    calculate_time_efficiency,
-    calculate_risk_score,
-    calculate_overall_score,
-    calculate_risk_indicators,
-    calculate_college_group_costs,
-    optimize_budget_swaps,
-    inject_meal_slots,
-    generate_multi_city_itinerary,
-    ATTRACTIONS
-)
+from utils.analysis import ATTRACTIONS, activity_label
+from utils.planner import run_strategy
+from utils import profiling, warmup
 
 # Page configuration
 st.set_page_config(page_title="VoyageIQ – AI Travel Analyzer", page_icon="✈️", layout="wide")
@@ -28,6 +16,15 @@ if os.path.exists(css_path):
     with open(css_path) as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
+# Pre-build per-city caches once per server process (VOYAGEIQ_WARMUP=1 or a cache file path)
+@st.cache_resource(show_spinner="Warming up destination caches...")
+def warm_caches(path):
+    return warmup.warm_start(path)
+
+warm_enabled, warm_path = warmup.warmup_path_from_env()
+if warm_enabled:
+    warm_caches(warm_path)
+
 # Get available cities from dataset
 available_cities = sorted(ATTRACTIONS['city'].unique().tolist())
 default_city = "Munnar" if "Munnar" in available_cities else available_cities[0]
@@ -75,39 +72,25 @@ st.markdown(f"""
     <p style='color: #94A3B8; margin-top: 0.5rem;'><b>AI Strategy for {' & '.join(destinations)} | {group_type} Mode</b></p>
 """, unsafe_allow_html=True)
 
-if btn_calculate:
+# Once a strategy exists, sidebar tweaks re-plan incrementally; the button forces a fresh itinerary
+if btn_calculate or "planner_state" in st.session_state:
     try:
-        # 1. Processing Itinerary
-        if is_multi_city:
-            itinerary = generate_multi_city_itinerary(destinations, days, interests, pace, group_type)
-        else:
-            itinerary = generate_itinerary(primary_dest, interests, pace, days, group_type)
-        
-        # Inject Meals
-        itinerary = inject_meal_slots(itinerary)
-        
-        total_activities = sum(len([a for a in d['activities'] if not a.get('is_meal')]) for d in itinerary)
-        
-        # 2. Financials
-        if group_type == "College Group":
-            budget_data = calculate_college_group_costs(students, staff, drivers, days, travel_type, month, total_activities, budget, primary_dest)
-        else:
-            budget_data = calculate_detailed_budget(budget, travel_type, days, month, total_activities, group_type, primary_dest)
-            
-        # Budget Optimization Swapper
-        swaps = []
-        if budget_data.get('score', 100) < 80:
-            itinerary, swaps = optimize_budget_swaps(itinerary, budget, 2000 if travel_type == "Budget" else 4000, primary_dest)
-            # Recalculate roughly (status check)
-            if swaps: budget_data['status'] = "Optimized Match"
-
-        risks = estimate_risk_factors(primary_dest, month)
-        exp_score, exp_status, exp_color = calculate_experience_score(itinerary, interests, primary_dest, group_type)
-        time_score, time_status, time_color, avg_h = calculate_time_efficiency(itinerary, group_type)
-        risk_score = calculate_risk_score(risks)
-        overall_val = calculate_overall_score(budget_data['score'], exp_score, time_score, risk_score)
-        
-        indicators = calculate_risk_indicators(budget, budget_data, month, itinerary, avg_h, group_type, pace, students, staff)
+        profiling.reset()
+        with profiling.span("strategy_pipeline"):
+            params = {
+                "destinations": destinations, "interests": interests, "pace": pace, "days": days,
+                "group_type": group_type, "travel_type": travel_type, "month": month, "budget": budget,
+                "students": students, "staff": staff, "drivers": drivers, "primary_dest": primary_dest,
+            }
+            res, st.session_state["planner_state"], recomputed = run_strategy(
+                params, st.session_state.get("planner_state"), force=("itinerary",) if btn_calculate else ()
+            )
+            itinerary, budget_data, swaps, budget_risk = res["itinerary"], res["budget_data"], res["swaps"], res["budget_risk"]
+            total_activities, risks, risk_score = res["total_activities"], res["risks"], res["risk_score"]
+            exp_score, time_score, avg_h = res["exp_score"], res["time_score"], res["avg_h"]
+            overall_val, indicators = res["overall"], res["indicators"]
+        if profiling.ENABLED:
+            profiling.log_snapshot()
 
         # 3. Score Dashboard
         st.markdown("<div class='overall-container'>", unsafe_allow_html=True)
@@ -159,7 +142,7 @@ if btn_calculate:
                     for slot in day['activities']:
                         icon = "🍱" if slot.get('is_meal') else "📍"
                         opt_badge = "✅ (Budget Optimized)" if slot.get('optimized') else ""
-                        st.markdown(f"**{slot['time']}** | {icon} {slot['activity']} {opt_badge}")
+                        st.markdown(f"**{slot['time']}** | {icon} {activity_label(slot)} {opt_badge}")
 
         with t2:
             st.subheader("Budget Optimization Swaps")
@@ -168,15 +151,28 @@ if btn_calculate:
             else:
                 st.info("No swaps required. Your budget comfortably fits the primary attractions.")
             st.table(pd.DataFrame(list(budget_data["breakdown"].items()), columns=["Category", "Amount (₹)"]))
+            basis = "per student" if budget_risk["basis"] == "per_student" else "trip total"
+            st.markdown(f"**Monte Carlo ({budget_risk['draws']:,} draws, {basis})**: P50 ₹{budget_risk['p50']:,} · P90 ₹{budget_risk['p90']:,} · "
+                        f"{int(budget_risk['prob_over_budget'] * 100)}% chance of exceeding ₹{int(budget):,}")
 
         with t3:
             st.subheader("Geographic Intelligence")
             st.write("Transit times calculated using Haversine Sphere Distance between actual Lat/Long coordinates.")
             for day in itinerary:
-                st.write(f"**Day {day['day']} Cluster**: {day['area']}")
+                zone = f" · Zone {day['cluster'] + 1}" if 'cluster' in day else ""
+                st.write(f"**Day {day['day']} Cluster**: {day['area']}{zone}")
 
         with t4:
             for r in risks: st.warning(f"**{r['type']}**: {r['desc']}")
+
+        # Hidden debug panel: VOYAGEIQ_PROFILE=1 and ?debug=1
+        if profiling.ENABLED and st.query_params.get("debug") == "1":
+            with st.expander("🛠️ Pipeline Profile", expanded=False):
+                prof = profiling.snapshot()
+                st.caption(f"Recomputed stages: {', '.join(recomputed) or 'none (all reused)'}")
+                st.table(pd.DataFrame([{"Stage": k, **v} for k, v in prof["spans"].items()]).sort_values("total_ms", ascending=False))
+                st.table(pd.DataFrame(list(prof["counters"].items()), columns=["Counter", "Value"]))
+                st.code(profiling.export_prometheus(), language="text")
                 
     except Exception as e:
         st.error(f"Logic Error: {str(e)}")
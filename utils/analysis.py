@@ -4,18 +4,189 @@ import os
 import pandas as pd
 import numpy as np
 import math
+from utils.profiling import traced, count
+from utils.itinerary_model import Day, Slot, is_model, itinerary_from_dicts, itinerary_to_dicts
+from utils.place_index import build_place_index
 
 # Data Loading Helpers using Pandas
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 
-def load_data():
-    attractions_df = pd.read_json(os.path.join(DATA_DIR, "attractions_india.json"))
-    hotels_df = pd.read_json(os.path.join(DATA_DIR, "hotel_prices_by_city.json"))
-    vehicles_df = pd.read_json(os.path.join(DATA_DIR, "transport_vehicles.json"))
-    seasonality_df = pd.read_csv(os.path.join(DATA_DIR, "tourism_seasonality.csv"))
+# Set to a utils.shared_catalog block (file path or shared-memory name) to attach instead of loading
+SHARED_CATALOG = os.environ.get("VOYAGEIQ_SHARED_CATALOG")
+
+def load_data(data_dir=DATA_DIR):
+    attractions_df = pd.read_json(os.path.join(data_dir, "attractions_india.json"))
+    hotels_df = pd.read_json(os.path.join(data_dir, "hotel_prices_by_city.json"))
+    vehicles_df = pd.read_json(os.path.join(data_dir, "transport_vehicles.json"))
+    seasonality_df = pd.read_csv(os.path.join(data_dir, "tourism_seasonality.csv"))
     return attractions_df, hotels_df, vehicles_df, seasonality_df
 
-ATTRACTIONS, HOTELS, VEHICLES, SEASONALITY = load_data()
+def load_risk_calendar(data_dir=DATA_DIR):
+    # Optional: synthetic/bench data dirs don't ship one, and then every lookup falls back to General/Low
+    path = os.path.join(data_dir, "risk_calendar.csv")
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["place", "months", "type", "level", "desc"])
+    return pd.read_csv(path)
+
+def load_shared(name):
+    from utils.shared_catalog import attach
+    frames, indexes = attach(name)
+    return (frames["ATTRACTIONS"], frames["HOTELS"], frames["VEHICLES"], frames["SEASONALITY"]), indexes
+
+if SHARED_CATALOG:
+    (ATTRACTIONS, HOTELS, VEHICLES, SEASONALITY), _SHARED_INDEXES = load_shared(SHARED_CATALOG)
+else:
+    (ATTRACTIONS, HOTELS, VEHICLES, SEASONALITY), _SHARED_INDEXES = load_data(), {}
+RISK_CALENDAR = load_risk_calendar()
+
+def _rows(df, col, value):
+    # Full-table equality scan; counted so profiling shows how often we hit the catalogue
+    count("df_scan")
+    return df[df[col] == value]
+
+# --- PER-CITY CACHE ---
+# Derived per-city artefacts keyed by (kind, key). Values are shared between
+# callers and must be treated as read-only. Call reset_caches() after
+# replacing ATTRACTIONS/HOTELS/VEHICLES/SEASONALITY/RISK_CALENDAR.
+_CACHE = {}
+
+def cached(kind, key, build):
+    cache_key = (kind, key)
+    if cache_key in _CACHE:
+        count("cache_hit")
+        return _CACHE[cache_key]
+    count("cache_miss")
+    value = _CACHE[cache_key] = build()
+    return value
+
+def reset_caches():
+    _CACHE.clear()
+
+def seed_caches(indexes):
+    # Prebuilt "kind/key" arrays (see catalogue_indexes), e.g. attached from a shared catalogue
+    for name, value in indexes.items():
+        kind, key = name.split("/", 1)
+        _CACHE[(kind, key)] = value
+
+seed_caches(_SHARED_INDEXES)
+
+def export_caches(kinds=None):
+    # Snapshot of (kind, key) -> value, e.g. for utils.warmup to persist
+    return {k: v for k, v in list(_CACHE.items()) if kinds is None or k[0] in kinds}
+
+def restore_caches(entries):
+    # Entries already present (e.g. attached from a shared catalogue) win; returns how many were added
+    added = 0
+    for cache_key, value in entries.items():
+        if cache_key not in _CACHE:
+            _CACHE[cache_key] = value
+            added += 1
+    return added
+
+def place_index():
+    # Catalogue names first; the reference lists stop unknown places snapping to a similar catalogue name
+    return cached("place_index", None, lambda: build_place_index(
+        list(ATTRACTIONS['city'].unique()) + list(ATTRACTIONS['state'].unique()) + list(HOTELS['city'])))
+
+def resolve_destination(destination):
+    # Catalogue names pass through; aliases ("Bengaluru") and misspellings ("Kerla") map to the closest name
+    return place_index().resolve(destination) or destination
+
+def city_rows(city):
+    city = resolve_destination(city)
+    # Only catalogue names get cache entries; anything else a caller sends would grow the cache forever
+    if city not in city_stats_table()["cities"]: return ATTRACTIONS.iloc[:0]
+    return cached("city_rows", city, lambda: _rows(ATTRACTIONS, 'city', city))
+
+def destination_pool(destination):
+    # City match first, then treat the destination as a state
+    destination = resolve_destination(destination)
+    table = city_stats_table()
+    if destination not in table["cities"] and destination not in table["states"]: return ATTRACTIONS.iloc[:0]
+    def build():
+        pool = _rows(ATTRACTIONS, 'city', destination)
+        return pool if not pool.empty else _rows(ATTRACTIONS, 'state', destination)
+    return cached("pool", destination, build)
+
+# --- PER-CITY STATISTICS ---
+MONTH_KEYS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+HOTEL_TIERS = ("budget", "standard", "luxury")
+
+def _season_multiplier(row, month):
+    # Both short and long month names match by their first three letters
+    curr_month_short = month[:3]
+    if any(m.strip().startswith(curr_month_short) for m in row['peak']):
+        return row['peak_multiplier']
+    elif any(m.strip().startswith(curr_month_short) for m in row['off']):
+        return row['off_multiplier']
+    return 1.0
+
+def build_city_stats(attractions, hotels, seasonality):
+    # Per-city lookup for budgeting and scoring: {cities, states, hotels, tag_bits, names}
+    tag_bits = {}
+    for tags in attractions['tags']:
+        for t in tags: tag_bits.setdefault(t, 1 << len(tag_bits))
+
+    def mask_of(tags):
+        m = 0
+        for t in tags: m |= tag_bits[t]
+        return m
+
+    names = {}
+    for name, tags in zip(attractions['name'], attractions['tags']):
+        if name not in names: names[name] = (tags, mask_of(tags))
+
+    hotel_tiers = {}
+    for row in hotels.to_dict('records'):
+        if row['city'] not in hotel_tiers:
+            hotel_tiers[row['city']] = {t: row[f"{t}_per_night"] for t in HOTEL_TIERS}
+
+    state_seasons = {}
+    for row in seasonality.to_dict('records'):
+        if row['state'] in state_seasons: continue
+        parsed = {"peak": str(row['peak_months']).split(','), "off": str(row['off_months']).split(','),
+                  "peak_multiplier": float(row['peak_multiplier']), "off_multiplier": float(row['off_multiplier'])}
+        parsed["months"] = {m: _season_multiplier(parsed, m) for m in MONTH_KEYS}
+        state_seasons[row['state']] = parsed
+
+    cities = {}
+    for city, grp in attractions.groupby('city', sort=False):
+        state = grp['state'].iloc[0]
+        costs = grp['avg_cost_per_person'].to_numpy(dtype=float)
+        p25, p50, p75, p90 = np.nanpercentile(costs, [25, 50, 75, 90])
+        mask = 0
+        for tags in grp['tags']: mask |= mask_of(tags)
+        hotel = hotel_tiers.get(city) or hotel_tiers.get(state)
+        cities[city] = {
+            "state": state,
+            "act_cost_mean": grp['avg_cost_per_person'].mean(),
+            "act_cost_p25": p25, "act_cost_p50": p50, "act_cost_p75": p75, "act_cost_p90": p90,
+            "act_costs": costs,
+            "tag_mask": mask,
+            "hotel": hotel,
+            "hotel_exact": hotel_tiers.get(city),
+            "season": state_seasons.get(state),
+        }
+
+    states = {}
+    for state in attractions['state'].unique():
+        states[state] = {"season": state_seasons.get(state)}
+
+    return {"cities": cities, "states": states, "hotels": hotel_tiers, "tag_bits": tag_bits, "names": names}
+
+def city_stats_table():
+    return cached("city_stats", None, lambda: build_city_stats(ATTRACTIONS, HOTELS, SEASONALITY))
+
+def city_stats(destination):
+    return city_stats_table()["cities"].get(destination)
+
+def attraction_ids():
+    # Attraction name -> catalogue id (first occurrence), for exports and joins
+    def build():
+        ids = {}
+        for name, aid in zip(ATTRACTIONS['name'], ATTRACTIONS['id']): ids.setdefault(name, aid)
+        return ids
+    return cached("attraction_ids", None, build)
 
 GROUP_INTELLIGENCE_SPECS = {
     "Solo": {"density": 4, "time_mult": 1.0, "pref_boost": {}},
@@ -27,6 +198,7 @@ GROUP_INTELLIGENCE_SPECS = {
 
 # --- GEOGRAPHIC ROUTING LOGIC ---
 def calculate_haversine_distance(lat1, lon1, lat2, lon2):
+    count("haversine")
     R = 6371 # Earth radius in km
     dlat = math.radians(lat2 - lat1)
     dlon = math.radians(lon2 - lon1)
@@ -40,6 +212,23 @@ def haversine_travel_time(lat1, lon1, lat2, lon2):
     transit_mins = (dist / 30) * 60
     return transit_mins + 15
 
+def haversine_matrix(lats, lons):
+    # Vectorised pairwise distances (km), same formula as calculate_haversine_distance
+    count("haversine_matrix")
+    lat = np.radians(np.asarray(lats, dtype=float))
+    lon = np.radians(np.asarray(lons, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2)**2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2)**2
+    return 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def travel_time_matrix(lats, lons):
+    return (haversine_matrix(lats, lons) / 30) * 60 + 15
+
+def _unlocated(lats, lons):
+    # Eco entries carry 0,0 placeholder coordinates; works on scalars and arrays
+    return (np.asarray(lats, dtype=float) == 0) & (np.asarray(lons, dtype=float) == 0)
+
 TIME_SLOTS = [
     "09:00 AM - 11:30 AM", 
     "11:45 AM - 01:00 PM", 
@@ -47,41 +236,26 @@ TIME_SLOTS = [
     "05:30 PM - 07:30 PM"
 ]
 
+@traced()
 def get_seasonal_multiplier(destination, month):
-    city_match = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-    if city_match.empty:
-        city_match = ATTRACTIONS[ATTRACTIONS['state'] == destination]
-    
-    if city_match.empty: return 1.0
-        
-    state = city_match.iloc[0]['state']
-    state_row = SEASONALITY[SEASONALITY['state'] == state]
-    if state_row.empty: return 1.0
-        
-    row = state_row.iloc[0]
-    # New format: state,peak_months,off_months,peak_multiplier,off_multiplier
-    peak = str(row['peak_months']).split(',')
-    off = str(row['off_months']).split(',')
-    
-    # Handle both short and long month names
-    curr_month_short = month[:3]
-    
-    if any(m.strip().startswith(curr_month_short) for m in peak): 
-        return float(row['peak_multiplier'])
-    elif any(m.strip().startswith(curr_month_short) for m in off): 
-        return float(row['off_multiplier'])
-    return 1.0
+    destination = resolve_destination(destination)
+    table = city_stats_table()
+    entry = table["cities"].get(destination) or table["states"].get(destination)
+    if entry is None or entry["season"] is None: return 1.0
 
+    season = entry["season"]
+    # Precomputed for canonical months; anything else goes through the matcher
+    mult = season["months"].get(month[:3]) if len(month) >= 3 else None
+    return mult if mult is not None else _season_multiplier(season, month)
+
+@traced()
 def calculate_detailed_budget(user_budget, travel_type, days, month, activity_count, group_type="Solo", destination="Kerala"):
-    hotel_row = HOTELS[HOTELS['city'] == destination]
-    if hotel_row.empty:
-        city_df = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-        if not city_df.empty:
-            state = city_df.iloc[0]['state']
-            hotel_row = HOTELS[HOTELS['city'] == state]
-
-    price_col = f"{travel_type.lower()}_per_night"
-    base_hotel_price = hotel_row.iloc[0][price_col] if not hotel_row.empty else 5000
+    destination = resolve_destination(destination)
+    table = city_stats_table()
+    stats = table["cities"].get(destination)
+    # Hotel tiers: exact city, else the city's state row (resolved in the stats table)
+    hotel = table["hotels"].get(destination) or (stats["hotel"] if stats else None)
+    base_hotel_price = hotel[travel_type.lower()] if hotel else 5000
     
     multiplier = get_seasonal_multiplier(destination, month)
     hotel_total = base_hotel_price * days * multiplier
@@ -94,8 +268,7 @@ def calculate_detailed_budget(user_budget, travel_type, days, month, activity_co
     elif group_type == "Family": transport_total *= 1.4
     elif group_type == "College Group": hotel_total *= 0.7
     
-    city_acts = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-    avg_act_cost = city_acts['avg_cost_per_person'].mean() if not city_acts.empty else 1000
+    avg_act_cost = stats["act_cost_mean"] if stats else 1000
     activity_total = activity_count * avg_act_cost * multiplier
     
     subtotal = hotel_total + food_total + transport_total + activity_total
@@ -120,13 +293,64 @@ def calculate_detailed_budget(user_budget, travel_type, days, month, activity_co
         }
     }
 
+# --- MONTE CARLO BUDGET RISK ---
+MC_DRAWS = 5000
+MC_MAX_DRAWS = 20000
+# Log-normal spreads (sigma) around the point estimate of each component
+MC_SIGMA = {"hotel": 0.20, "season": 0.08, "food": 0.15, "transport": 0.30, "activity": 0.30}
+
+def _lognormal(rng, sigma, draws):
+    # Mean-one multiplicative noise
+    return rng.lognormal(-sigma**2 / 2, sigma, draws)
+
+@traced()
+def simulate_budget_risk(budget_data, user_budget, destination, month, activity_count, draws=MC_DRAWS, seed=0):
+    # Re-prices each breakdown line over 'draws' samples; the spread replaces the flat 10% buffer
+    draws = max(1, min(int(draws), MC_MAX_DRAWS))
+    rng = np.random.default_rng(seed)
+    breakdown = budget_data.get("breakdown", {})
+    multiplier = get_seasonal_multiplier(destination, month)
+    season = _lognormal(rng, MC_SIGMA["season"] if multiplier != 1.0 else MC_SIGMA["season"] / 2, draws)
+
+    stats = city_stats(resolve_destination(destination))
+    costs = stats["act_costs"] if stats else np.empty(0)
+    costs = costs[~np.isnan(costs)]
+    if activity_count > 0 and len(costs) and costs.mean() > 0:
+        # Bootstrap one activity at a time: memory stays O(draws) whatever the activity count
+        picked = np.zeros(draws)
+        for _ in range(activity_count):
+            picked += costs[rng.integers(0, len(costs), draws)]
+        activity = picked / activity_count / costs.mean()
+    else:
+        activity = _lognormal(rng, MC_SIGMA["activity"], draws)
+
+    total = (breakdown.get("Accommodation", 0) * _lognormal(rng, MC_SIGMA["hotel"], draws) * season
+             + breakdown.get("Activities", 0) * activity * season
+             + breakdown.get("Food & Dining", breakdown.get("Food", 0)) * _lognormal(rng, MC_SIGMA["food"], draws)
+             + breakdown.get("Local Transport", breakdown.get("Transport", 0)) * _lognormal(rng, MC_SIGMA["transport"], draws))
+
+    per_student = "per_student_cost" in budget_data
+    if per_student and budget_data.get("total_estimated"):
+        total = total * (budget_data["per_student_cost"] / budget_data["total_estimated"])
+    p10, p50, p90 = np.percentile(total, [10, 50, 90])
+    return {
+        "draws": draws,
+        "basis": "per_student" if per_student else "trip",
+        "mean": int(total.mean()),
+        "p10": int(p10), "p50": int(p50), "p90": int(p90),
+        "prob_over_budget": round(float((total > user_budget).mean()), 3),
+    }
+
+@traced()
 def calculate_college_group_costs(students, staff, drivers, days, travel_type, month, activity_count, user_budget, destination="Kerala"):
+    destination = resolve_destination(destination)
     total_participants = students + staff + drivers
     multiplier = get_seasonal_multiplier(destination, month)
     
-    hotel_row = HOTELS[HOTELS['city'] == destination]
-    price_col = f"{travel_type.lower()}_per_night"
-    base_hotel_price = hotel_row.iloc[0][price_col] if not hotel_row.empty else 3000
+    table = city_stats_table()
+    stats = table["cities"].get(destination)
+    hotel = table["hotels"].get(destination)
+    base_hotel_price = hotel[travel_type.lower()] if hotel else 3000
     staff_hotel_price = base_hotel_price * 1.25 
     
     base_hotel_price *= multiplier
@@ -136,16 +360,15 @@ def calculate_college_group_costs(students, staff, drivers, days, travel_type, m
     staff_rooms = (staff + 1) // 2 
     accommodation_cost = (student_rooms * base_hotel_price * days) + (staff_rooms * staff_hotel_price * days)
     
-    v_type = "Bus" if total_participants > 25 else "Tempo Traveler"
-    v_data = VEHICLES[VEHICLES['vehicle'] == v_type].iloc[0]
+    v_type = "Bus" if total_participants > 25 else "Tempo Traveller"
+    v_data = _rows(VEHICLES, 'vehicle', v_type).iloc[0]
     vehicles = (total_participants + (v_data['capacity']-1)) // v_data['capacity']
     transport_cost = vehicles * v_data['base_cost_per_day'] * days
     
     per_person_food = (1200 if travel_type != "Budget" else 700) * multiplier
     food_cost = total_participants * per_person_food * days
     
-    city_acts = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-    avg_act_fee = city_acts['avg_cost_per_person'].mean() if not city_acts.empty else 1000
+    avg_act_fee = stats["act_cost_mean"] if stats else 1000
     activity_cost = total_participants * avg_act_fee * activity_count * multiplier
     
     if total_participants > 20: activity_cost *= 0.85
@@ -179,9 +402,66 @@ def calculate_college_group_costs(students, staff, drivers, days, travel_type, m
         }
     }
 
-def generate_itinerary(destination, interests, pace, days, group_type="Solo"):
-    pool = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-    if pool.empty: pool = ATTRACTIONS[ATTRACTIONS['state'] == destination]
+# --- GEO DAY CLUSTERS ---
+KMEANS_ITERS = 25
+# Keeps k-means cheap on state-sized pools, whose clusters then grow past one day
+MAX_DAY_CLUSTERS = 60
+
+def kmeans_geo(lats, lons, k, iters=KMEANS_ITERS):
+    # Deterministic Lloyd's k-means on an equirectangular projection (km), farthest-point seeding.
+    # Returns (labels, centroids as [lat, lon]).
+    lat = np.asarray(lats, dtype=float)
+    lon = np.asarray(lons, dtype=float)
+    k = max(1, min(k, len(lat)))
+    scale = np.array([111.0, 111.0 * math.cos(math.radians(lat.mean()))])
+    pts = np.column_stack([lat, lon]) * scale
+
+    centers = [pts[np.argmax(((pts - pts.mean(axis=0))**2).sum(axis=1))]]
+    nearest = ((pts - centers[0])**2).sum(axis=1)
+    while len(centers) < k:
+        centers.append(pts[np.argmax(nearest)])
+        nearest = np.minimum(nearest, ((pts - centers[-1])**2).sum(axis=1))
+    centers = np.array(centers)
+
+    labels = np.zeros(len(pts), dtype=int)
+    for _ in range(iters):
+        new_labels = ((pts[:, None, :] - centers[None, :, :])**2).sum(axis=2).argmin(axis=1)
+        if _ and np.array_equal(new_labels, labels): break
+        labels = new_labels
+        for c in range(k):
+            members = pts[labels == c]
+            if len(members): centers[c] = members.mean(axis=0)
+    return labels, centers / scale
+
+def geo_clusters(destination, k):
+    # (labels aligned with the pool index, neighbours[c] = other clusters by centroid distance), cached per (destination, k).
+    # 0,0 placeholder rows (eco entries) stay out of k-means and join their city's main cluster, else the smallest.
+    def build():
+        pool = destination_pool(destination)
+        lat = pool['latitude'].to_numpy(dtype=float)
+        lon = pool['longitude'].to_numpy(dtype=float)
+        located = ~_unlocated(lat, lon)
+        labels = np.zeros(len(pool), dtype=int)
+        if not located.any():
+            return pd.Series(labels, index=pool.index), [[]]
+        labels[located], centroids = kmeans_geo(lat[located], lon[located], k)
+        cities = pool['city'].to_numpy()
+        sizes = np.bincount(labels[located], minlength=len(centroids))
+        for city in dict.fromkeys(cities[~located]):
+            rows = ~located & (cities == city)
+            anchored = labels[located & (cities == city)]
+            c = int(np.bincount(anchored).argmax()) if len(anchored) else int(sizes.argmin())
+            labels[rows] = c
+            sizes[c] += rows.sum()
+        gaps = haversine_matrix(centroids[:, 0], centroids[:, 1])
+        neighbours = [[int(o) for o in np.argsort(gaps[c], kind='stable') if o != c] for c in range(len(centroids))]
+        return pd.Series(labels, index=pool.index), neighbours
+    return cached("clusters", (destination, k), build)
+
+@traced()
+def generate_itinerary(destination, interests, pace, days, group_type="Solo", as_model=False):
+    destination = resolve_destination(destination)
+    pool = destination_pool(destination)
     if pool.empty: return []
 
     if interests:
@@ -194,31 +474,32 @@ def generate_itinerary(destination, interests, pace, days, group_type="Solo"):
     target_count = base_density if pace == "Fast" else max(1, base_density - 1)
     
     itinerary = []
-    areas = list(pool['area'].unique())
-    random.shuffle(areas)
+    # Clusters hold about one day's worth of POIs at this pace, whatever the trip length
+    k = max(1, min(MAX_DAY_CLUSTERS, len(pool) // target_count))
+    labels, neighbours = geo_clusters(destination, k)
     
     used_activities = set()
     
     # Pre-shuffle the pool slightly to avoid always picking the same top-popularity items
     pool = pool.sample(frac=1).sort_values('popularity_score', ascending=False)
+    pool_cluster = labels.reindex(pool.index).to_numpy()
     
     for d in range(1, days + 1):
-        if not areas: 
-            areas = list(pool['area'].unique())
-            random.shuffle(areas)
-            
-        area = areas.pop(0)
-        
-        # Filter out already used activities to ensure variety
-        available_in_area = pool[(pool['area'] == area) & (~pool['name'].isin(used_activities))]
+        # Filter out already used activities to ensure variety (repeating sights only once everything is used)
+        count("df_scan")
+        unused = ~pool['name'].isin(used_activities).to_numpy()
+        free = unused if unused.any() else np.ones(len(pool), dtype=bool)
+        # The day goes to the cluster of the most popular free sight
+        cluster = int(pool_cluster[free.argmax()])
+        available_in_area = pool[(pool_cluster == cluster) & free]
         
-        # If we run out of new items in this area, try other areas for this day
+        # Top up from the nearest clusters
         if len(available_in_area) < target_count:
-            unused_in_pool = pool[~pool['name'].isin(used_activities)]
-            if not unused_in_pool.empty:
-                available_in_area = unused_in_pool
-            else:
-                available_in_area = pool[pool['area'] == area]
+            take = [cluster]
+            for other in neighbours[cluster]:
+                if (np.isin(pool_cluster, take) & free).sum() >= target_count: break
+                take.append(other)
+            available_in_area = pool[np.isin(pool_cluster, take) & free]
             
         acts_samples = available_in_area.to_dict('records')
         top_candidates = acts_samples[:max(target_count*2, len(acts_samples))] # Get more candidates to route
@@ -240,42 +521,175 @@ def generate_itinerary(destination, interests, pace, days, group_type="Solo"):
                 current_selection.append(top_candidates.pop(0))
         
         acts = current_selection
+        area = acts[0]['area'] if acts else pool['area'].iloc[0]
         
         day_acts = []
         for idx, a in enumerate(acts):
             used_activities.add(a['name'])
+            time_slot = TIME_SLOTS[idx] if idx < len(TIME_SLOTS) else "Evening Flex"
+            if as_model:
+                day_acts.append(Slot(time_slot, a['name'], a['avg_cost_per_person'], a['avg_time_hours'], a['latitude'], a['longitude']))
+                continue
             day_acts.append({
-                "time": TIME_SLOTS[idx] if idx < len(TIME_SLOTS) else "Evening Flex",
+                "time": time_slot,
                 "activity": a['name'],
                 "cost": a['avg_cost_per_person'],
                 "duration": a['avg_time_hours'],
                 "lat": a['latitude'],
                 "lon": a['longitude']
             })
-        itinerary.append({"day": d, "area": area, "activities": day_acts})
+        itinerary.append(Day(d, area, day_acts, cluster=cluster) if as_model else {"day": d, "area": area, "activities": day_acts, "cluster": cluster})
     return itinerary
 
+# --- TOP-K ALTERNATIVES ---
+def destination_distance_matrix(destination):
+    # Pairwise km between every POI of the destination pool, row order = destination_pool order
+    def build():
+        pool = destination_pool(destination)
+        return haversine_matrix(pool['latitude'].to_numpy(), pool['longitude'].to_numpy())
+    return cached("dist", destination, build)
+
+def catalogue_indexes(attractions):
+    # Derived per-city arrays worth sharing between workers; keys match the cache ("kind/key")
+    indexes = {}
+    for city, grp in attractions.groupby('city', sort=False):
+        indexes[f"dist/{city}"] = haversine_matrix(grp['latitude'].to_numpy(), grp['longitude'].to_numpy())
+    return indexes
+
+def _itinerary_overlap(a, b):
+    names_a = {x['activity'] for d in a for x in d['activities']}
+    names_b = {x['activity'] for d in b for x in d['activities']}
+    union = names_a | names_b
+    # Two empty itineraries are the same option
+    return len(names_a & names_b) / len(union) if union else 1.0
+
+@traced()
+def generate_itinerary_alternatives(destination, interests, pace, days, group_type="Solo", k=3, budget_score=100, risk_score=100, diversity=0.5, max_gap=15):
+    # Up to k itineraries trading overall score against overlap with those already chosen
+    # Duplicates and options more than max_gap below the best are dropped, so small pools return fewer than k
+    destination = resolve_destination(destination)
+    full_pool = destination_pool(destination)
+    if full_pool.empty or days < 1: return []
+    dist = destination_distance_matrix(destination)
+
+    all_positions = positions = np.arange(len(full_pool))
+    if interests:
+        mask = full_pool['tags'].apply(lambda tags: any(i in tags for i in interests)).to_numpy()
+        if mask.any(): positions = positions[mask]
+
+    records = full_pool.to_dict('records')
+    popularity = full_pool['popularity_score'].to_numpy(dtype=float)
+    base_density = GROUP_INTELLIGENCE_SPECS.get(group_type, {}).get("density", 3)
+    target_count = base_density if pace == "Fast" else max(1, base_density - 1)
+    areas = full_pool['area'].to_numpy()
+    # Placeholder rows count as a typical hop from 'last', not 8000 km
+    unknown = _unlocated(full_pool['latitude'], full_pool['longitude'])
+
+    usage = np.zeros(len(full_pool))
+    candidates = []
+    for _ in range(max(k * 3, 6)):
+        # Penalise attractions earlier candidates leaned on so seeds fan out
+        rank = popularity - 15 * usage
+        used = set()
+        itinerary = []
+        for d in range(1, days + 1):
+            # Unused interest matches first, then any unused POI, then allow repeats
+            free = [p for p in positions if p not in used] or [p for p in all_positions if p not in used] or list(positions)
+            first = max(free, key=lambda p: rank[p])
+            day_pos = [first]
+            free.remove(first)
+            while len(day_pos) < target_count and free:
+                last = day_pos[-1]
+                free_arr = np.array(free)
+                legs = dist[last, free_arr]
+                blind = unknown[free_arr] | unknown[last]
+                if blind.any():
+                    seen = legs[~blind]
+                    legs = np.where(blind, np.median(seen) if len(seen) else 0.0, legs)
+                nxt = int(free_arr[np.argmin(legs - 0.05 * rank[free_arr])])
+                day_pos.append(nxt)
+                free.remove(nxt)
+            used.update(day_pos)
+            itinerary.append({"day": d, "area": areas[first], "activities": [{
+                "time": TIME_SLOTS[idx] if idx < len(TIME_SLOTS) else "Evening Flex",
+                "activity": records[p]['name'],
+                "cost": records[p]['avg_cost_per_person'],
+                "duration": records[p]['avg_time_hours'],
+                "lat": records[p]['latitude'],
+                "lon": records[p]['longitude']
+            } for idx, p in enumerate(day_pos)]})
+        for p in used: usage[p] += 1
+        candidates.append(itinerary)
+
+    scored = []
+    for itinerary in candidates:
+        exp_score = calculate_experience_score(itinerary, interests, destination, group_type)[0]
+        time_score, _, _, avg_h = calculate_time_efficiency(itinerary, group_type)
+        overall = calculate_overall_score(budget_score, exp_score, time_score, risk_score)
+        scored.append({"itinerary": itinerary, "overall": overall, "experience": exp_score, "time_efficiency": time_score, "avg_transit_hours": avg_h})
+
+    chosen = []
+    remaining = sorted(scored, key=lambda c: c["overall"], reverse=True)
+    floor = remaining[0]["overall"] - max_gap
+    remaining = [c for c in remaining if c["overall"] >= floor]
+    while remaining and len(chosen) < k:
+        def value(c):
+            overlap = max((_itinerary_overlap(c["itinerary"], o["itinerary"]) for o in chosen), default=0.0)
+            return c["overall"] - diversity * 100 * overlap
+        best = max(remaining, key=value)
+        remaining.remove(best)
+        best["overlap"] = round(max((_itinerary_overlap(best["itinerary"], o["itinerary"]) for o in chosen), default=0.0), 3)
+        if best["overlap"] >= 1.0:
+            continue  # same attractions as an option already offered
+        chosen.append(best)
+    return chosen
+
 # --- BUDGET OPTIMIZATION LOGIC ---
+def _parse_mins(clock):
+    # "02:45 PM" -> minutes after midnight
+    hm, ampm = clock.split()
+    h, m = map(int, hm.split(":"))
+    return (h % 12 + (12 if ampm == "PM" else 0)) * 60 + m
+
+def _swap_time(slot_time, duration_h):
+    # Scheduled slots are timed to their activity; re-time the swap from the same start.
+    # generate_itinerary's fixed TIME_SLOTS (and labels like "All Day") are kept as they are.
+    if slot_time in TIME_SLOTS or " - " not in slot_time: return slot_time
+    start = _parse_mins(slot_time.split(" - ")[0])
+    return f"{_fmt_mins(start)} - {_fmt_mins(start + duration_h * 60)}"
+
+@traced()
 def optimize_budget_swaps(itinerary, user_budget, per_item_limit, destination):
-    pool = ATTRACTIONS[ATTRACTIONS['city'] == destination]
-    if pool.empty: pool = ATTRACTIONS[ATTRACTIONS['state'] == destination]
+    pool = destination_pool(destination)
     
     swaps = []
     new_itinerary = []
+    model = is_model(itinerary)
+    replaced = set()  # multi-day activities swapped out; their continuation days go too
     
     for day in itinerary:
         new_acts = []
         day_swaps = 0
-        for act in day['activities']:
+        day_no = day.day if model else day['day']
+        for act in (day.activities if model else day['activities']):
+            name, cost = (act.activity, act.cost) if model else (act['activity'], act.get('cost', 0))
+            part = act.part if model else act.get('part')
+            if (act.continued if model else act.get('continued')) and name in replaced:
+                continue
             # If it's a meal or under limit, keep it
-            if act.get('is_meal') or act.get('cost', 0) <= per_item_limit or day_swaps >= 2:
+            if (act.is_meal if model else act.get('is_meal')) or cost <= per_item_limit or day_swaps >= 2:
                 new_acts.append(act)
                 continue
             
             # Find cheaper alternatives with matching tags
-            orig_tags = set(ATTRACTIONS[ATTRACTIONS['name'] == act['activity']].iloc[0]['tags']) if act['activity'] in ATTRACTIONS['name'].values else set()
+            known = city_stats_table()["names"].get(name)
+            orig_tags = set(known[0]) if known else set()
             
-            cheaper = pool[(pool['avg_cost_per_person'] < act['cost']) & (pool['avg_cost_per_person'] <= per_item_limit)]
+            cheaper = pool[(pool['avg_cost_per_person'] < cost) & (pool['avg_cost_per_person'] <= per_item_limit)]
+            slot_time = act.time if model else act['time']
+            if not part and slot_time not in TIME_SLOTS and " - " in slot_time:
+                # A scheduled slot only takes an alternative that fits the time it held
+                cheaper = cheaper[cheaper['avg_time_hours'] <= float((act.duration if model else act.get('duration')) or 0)]
             if not cheaper.empty and orig_tags:
                 # Use a combined score of popularity and tag matching
                 cheaper = cheaper.copy()
@@ -283,20 +697,37 @@ def optimize_budget_swaps(itinerary, user_budget, per_item_limit, destination):
                 cheaper = cheaper.sort_values(['match_score', 'popularity_score'], ascending=False)
                 
                 alt = cheaper.iloc[0]
-                swaps.append(f"Day {day['day']}: {act['activity']} → {alt['name']} (Saved ₹{int(act['cost']-alt['avg_cost_per_person'])})")
-                new_acts.append({
-                    "time": act['time'], "activity": alt['name'], "cost": alt['avg_cost_per_person'], 
-                    "duration": alt['avg_time_hours'], "optimized": True, "lat": alt['latitude'], "lon": alt['longitude']
-                })
+                swaps.append(f"Day {day_no}: {name} → {alt['name']} (Saved ₹{int(cost-alt['avg_cost_per_person'])})")
+                if part: replaced.add(name)
+                new_time = _swap_time(slot_time, alt['avg_time_hours'])
+                if model:
+                    new_acts.append(Slot(new_time, alt['name'], alt['avg_cost_per_person'], alt['avg_time_hours'],
+                                         alt['latitude'], alt['longitude'], optimized=True))
+                else:
+                    new_acts.append({
+                        "time": new_time, "activity": alt['name'], "cost": alt['avg_cost_per_person'], 
+                        "duration": alt['avg_time_hours'], "optimized": True, "lat": alt['latitude'], "lon": alt['longitude']
+                    })
                 day_swaps += 1
             else:
                 new_acts.append(act)
-        new_itinerary.append({"day": day['day'], "area": day['area'], "activities": new_acts})
+        if model:
+            new_itinerary.append(Day(day_no, day.area, new_acts, day.transit_info, day.cluster))
+        else:
+            new_day = {"day": day_no, "area": day['area'], "activities": new_acts}
+            if 'cluster' in day: new_day['cluster'] = day['cluster']
+            if 'transit_info' in day: new_day['transit_info'] = day['transit_info']
+            new_itinerary.append(new_day)
     return new_itinerary, swaps
 
 # --- MEAL SLOT LOGIC ---
+@traced()
 def inject_meal_slots(itinerary):
     for day in itinerary:
+        if isinstance(day, Day):
+            day.activities.insert(2, Slot("01:00 PM - 02:30 PM", f"🍱 Lunch: Local Food in {day.area}", 800, 1.5, is_meal=True))
+            day.activities.append(Slot("08:00 PM - 09:30 PM", f"🍽️ Dinner: {day.area} Cuisine Night", 1200, 1.5, is_meal=True))
+            continue
         area = day['area']
         # Fixed timings to avoid slot 1 and 2 overlaps
         day['activities'].insert(2, { # Insert after Slot 0 and Slot 1
@@ -307,8 +738,168 @@ def inject_meal_slots(itinerary):
         })
     return itinerary
 
+# --- TIME-WINDOW SCHEDULER ---
+DAY_START_MINS = 9 * 60
+DAY_END_MINS = 21 * 60 + 30
+MEAL_MINS = 90
+LUNCH_WINDOW = (12 * 60 + 30, 14 * 60)                 # earliest / latest lunch start
+DINNER_WINDOW = (19 * 60 + 30, DAY_END_MINS - MEAL_MINS)  # dinner ends by DAY_END_MINS
+
+def _fmt_mins(mins):
+    h, m = divmod(int(round(mins)), 60)
+    return f"{(h - 1) % 12 + 1:02d}:{m:02d} {'AM' if h < 12 else 'PM'}"
+
+def _meal(kind, area, start):
+    if kind == "lunch":
+        name, cost = f"🍱 Lunch: Local Food in {area}", 800
+    else:
+        name, cost = f"🍽️ Dinner: {area} Cuisine Night", 1200
+    return {"time": f"{_fmt_mins(start)} - {_fmt_mins(start + MEAL_MINS)}", "activity": name, "cost": cost, "duration": MEAL_MINS / 60, "is_meal": True}
+
+@traced()
+def schedule_itinerary(itinerary):
+    # Packs activities on duration plus travel with meals in their windows; overflow rolls to the next day of the same city
+    # Activities longer than a day block whole days (parts "1/2", "2/2" or "full"); replaces inject_meal_slots
+    if not itinerary: return itinerary
+    as_model = is_model(itinerary)
+    if as_model: itinerary = itinerary_to_dicts(itinerary)
+
+    acts = [a for d in itinerary for a in d['activities'] if not a.get('is_meal')]
+    index = {id(a): i for i, a in enumerate(acts)}
+    coords = [(a.get('lat', 0.0), a.get('lon', 0.0)) for a in acts]
+    travel = travel_time_matrix([c[0] for c in coords], [c[1] for c in coords]) if acts else None
+    if acts:
+        # Legs to or from placeholder coordinates cost only the traffic buffer
+        unknown = _unlocated([c[0] for c in coords], [c[1] for c in coords])
+        travel[unknown, :] = 15
+        travel[:, unknown] = 15
+    day_length_h = (DAY_END_MINS - DAY_START_MINS) / 60
+
+    scheduled = []
+    carry = []          # activities pushed from the previous day
+    continuing = None   # (act, days_left, total_days) for multi-day activities
+    dropped = 0
+    prev_area = None
+    for day in itinerary:
+        area = day['area']
+        if prev_area is not None and (area != prev_area or 'transit_info' in day):
+            # A new city starts fresh; what didn't fit (and unfinished multi-day days) is lost
+            dropped += len(carry) + (continuing[1] if continuing is not None else 0)
+            carry, continuing = [], None
+        prev_area = area
+        slots, t, prev = [], DAY_START_MINS, None
+        meals = {"lunch": False, "dinner": False}
+
+        def place_meals(before, span_start=None):
+            # Seat any meal that would be missed if the day ran on until 'before', never starting before t.
+            # A long activity (4h+) running through the window takes the meal on site.
+            # None when a due meal can no longer start inside its window.
+            nonlocal t
+            on_site = []
+            for kind, (earliest, latest) in (("lunch", LUNCH_WINDOW), ("dinner", DINNER_WINDOW)):
+                if meals[kind] or before <= latest: continue
+                if span_start is not None and before - span_start >= 240 and span_start <= earliest and before >= earliest + MEAL_MINS:
+                    meals[kind] = True
+                    on_site.append((kind, _meal(kind, area, earliest)))
+                    continue
+                start = max(t, earliest)
+                if start > latest: return None
+                meals[kind] = True
+                slots.append(_meal(kind, area, start))
+                t = start + MEAL_MINS
+            return on_site
+
+        new_day = {"day": day['day'], "area": area, "activities": slots}
+        if 'cluster' in day: new_day['cluster'] = day['cluster']
+        if 'transit_info' in day: new_day['transit_info'] = day['transit_info']
+
+        if continuing is not None:
+            act, left, total = continuing
+            slots.append({**act, "time": "All Day", "part": f"{total - left + 1}/{total}", "cost": 0, "continued": True})
+            place_meals(DAY_END_MINS)
+            continuing = (act, left - 1, total) if left > 1 else None
+            carry = carry + [a for a in day['activities'] if not a.get('is_meal')]
+            scheduled.append(new_day)
+            continue
+
+        queue = carry + [a for a in day['activities'] if not a.get('is_meal')]
+        carry = []
+        for pos, act in enumerate(queue):
+            dur = float(act.get('duration') or 0) * 60
+            if dur > day_length_h * 60:
+                if slots:  # a multi-day activity starts on a fresh morning
+                    carry.extend(queue[pos:])
+                    break
+                total = max(1, math.ceil(dur / (24 * 60)))
+                slots.append({**act, "time": f"{_fmt_mins(DAY_START_MINS)} - {_fmt_mins(DAY_END_MINS)}",
+                              "part": f"1/{total}" if total > 1 else "full"})
+                continuing = (act, total - 1, total) if total > 1 else None
+                place_meals(DAY_END_MINS)  # meals en route, inside their windows
+                t = DAY_END_MINS
+                carry.extend(queue[pos + 1:])
+                break
+
+            leg = travel[index[id(prev)], index[id(act)]] if prev is not None else 0
+            start = t + leg
+            if start + dur > DAY_END_MINS:
+                carry.extend(queue[pos:])
+                break
+            saved = (t, dict(meals), len(slots))
+            on_site = []
+            while True:
+                # A meal seated first pushes the activity later, which can make the next meal due
+                seated = place_meals(start + dur, start)
+                if seated is None: break
+                on_site += seated
+                if t + leg == start: break
+                start = t + leg
+            if seated is None or start + dur > DAY_END_MINS:
+                t, before_meals, seated_count = saved
+                meals.update(before_meals)
+                del slots[seated_count:]
+                carry.extend(queue[pos:])
+                break
+            slots.append({**act, "time": f"{_fmt_mins(start)} - {_fmt_mins(start + dur)}"})
+            slots.extend(meal for _, meal in on_site)
+            t, prev = start + dur, act
+        place_meals(DAY_END_MINS)
+        assert not schedule_conflicts(new_day), schedule_conflicts(new_day)
+        scheduled.append(new_day)
+
+    dropped += len(carry) + (continuing[1] if continuing is not None else 0)
+    if dropped: count("scheduler_dropped", dropped)
+    return itinerary_from_dicts(scheduled) if as_model else scheduled
+
+def _slot_span(time):
+    # "09:00 AM - 11:30 AM" -> (540, 690); "All Day" spans the whole scheduler day
+    if " - " not in time: return DAY_START_MINS, DAY_END_MINS
+    start, end = time.split(" - ")
+    return _parse_mins(start), _parse_mins(end)
+
+def schedule_conflicts(day):
+    # Problems in one scheduled day: slots past DAY_END_MINS, and overlaps other than a meal taken inside an activity
+    model = isinstance(day, Day)
+    slots = [(a.activity, a.is_meal, _slot_span(a.time)) if model else (a['activity'], bool(a.get('is_meal')), _slot_span(a['time']))
+             for a in (day.activities if model else day['activities'])]
+    problems = [f"{name} ends after {_fmt_mins(DAY_END_MINS)}" for name, _, (_, end) in slots if end > DAY_END_MINS]
+    for i, (name_a, meal_a, (s_a, e_a)) in enumerate(slots):
+        for name_b, meal_b, (s_b, e_b) in slots[i + 1:]:
+            if s_a >= e_b or s_b >= e_a: continue
+            if meal_a != meal_b and (s_a <= s_b and e_b <= e_a if meal_b else s_b <= s_a and e_a <= e_b): continue
+            problems.append(f"{name_a} overlaps {name_b}")
+    return problems
+
+def activity_label(slot):
+    # Display name for a slot; the scheduler keeps the attraction name in 'activity' and the day span in 'part'
+    name, part = (slot.activity, slot.part) if isinstance(slot, Slot) else (slot['activity'], slot.get('part'))
+    if not part: return name
+    if part == "full": return f"{name} (Full Day)"
+    continued = slot.continued if isinstance(slot, Slot) else slot.get('continued')
+    return f"{'↪ ' if continued else ''}{name} (Day {part})"
+
 # --- MULTI-CITY LOGIC ---
-def generate_multi_city_itinerary(dest_list, days, interests, pace, group_type):
+@traced()
+def generate_multi_city_itinerary(dest_list, days, interests, pace, group_type, as_model=False):
     itinerary = []
     days_per_city = days // len(dest_list)
     remaining = days % len(dest_list)
@@ -324,8 +915,8 @@ def generate_multi_city_itinerary(dest_list, days, interests, pace, group_type):
             prev_city = dest_list[i-1]
             # Try to get coordinates for transit estimation (simulated check)
             # For now we use the first attraction of each city as proxy
-            prev_pool = ATTRACTIONS[ATTRACTIONS['city'] == prev_city]
-            curr_pool = ATTRACTIONS[ATTRACTIONS['city'] == city]
+            prev_pool = city_rows(prev_city)
+            curr_pool = city_rows(city)
             
             if not prev_pool.empty and not curr_pool.empty:
                 dist = calculate_haversine_distance(
@@ -338,59 +929,109 @@ def generate_multi_city_itinerary(dest_list, days, interests, pace, group_type):
                 transit_note = f"🚗 Transit: {prev_city} → {city}"
             
             # Inject transit into the first day of the new city
-            city_itin = generate_itinerary(city, interests, pace, d_count, group_type)
+            city_itin = generate_itinerary(city, interests, pace, d_count, group_type, as_model)
             if city_itin:
-                city_itin[0]['transit_info'] = transit_note
+                if as_model: city_itin[0].transit_info = transit_note
+                else: city_itin[0]['transit_info'] = transit_note
         else:
-            city_itin = generate_itinerary(city, interests, pace, d_count, group_type)
+            city_itin = generate_itinerary(city, interests, pace, d_count, group_type, as_model)
 
         for d in city_itin:
-            d['day'] = current_day
+            if as_model: d.day = current_day
+            else: d['day'] = current_day
             current_day += 1
         itinerary.extend(city_itin)
         
     return itinerary
 
+# --- RISK CALENDAR ---
+DEFAULT_RISK = {"type": "General", "level": "Low", "desc": "Stability confirmed."}
+
+def build_risk_index(calendar):
+    # (place, "Jul") -> tuple of rules, in calendar order
+    index = {}
+    for row in calendar.to_dict('records'):
+        rule = {"type": row['type'], "level": row['level'], "desc": row['desc']}
+        for m in str(row['months']).split(','):
+            index.setdefault((row['place'], m.strip()[:3]), []).append(rule)
+    return {k: tuple(v) for k, v in index.items()}
+
+def risk_index():
+    return cached("risk_index", None, lambda: build_risk_index(RISK_CALENDAR))
+
+def risk_lookup(destination, month):
+    # City rules first, then the rules of the city's state; a state destination only gets its own
+    index = risk_index()
+    place = resolve_destination(destination)
+    stats = city_stats(place)
+    places = [place] if stats is None or stats["state"] == place else [place, stats["state"]]
+    if destination not in places: places.insert(0, destination)
+    key = str(month)[:3]
+    matched = []
+    for p in places:
+        matched.extend(index.get((p, key), ()))
+    return matched
+
+@traced()
 def estimate_risk_factors(destination, month):
-    risks = []
-    if destination in ["Kerala", "Goa"] and month in ["June", "July", "August"]:
-        risks.append({"type": "Weather", "level": "High", "desc": "Monsoon Peak: Heavy rain hazards."})
-    if destination == "Dubai" and month in ["June", "July", "August"]:
-        risks.append({"type": "Climate", "level": "High", "desc": "Extreme Heat (>45°C). Use caution."})
-    if not risks: risks.append({"type": "General", "level": "Low", "desc": "Stability confirmed."})
+    risks = [dict(r) for r in risk_lookup(destination, month)]
+    if not risks: risks.append(dict(DEFAULT_RISK))
     return risks
 
+def estimate_risk_factors_batch(destinations, months):
+    # Quoting path: one lookup per distinct (destination, month) pair
+    seen = {}
+    out = []
+    for destination, month in zip(destinations, months):
+        key = (destination, month)
+        if key not in seen: seen[key] = estimate_risk_factors(destination, month)
+        out.append([dict(r) for r in seen[key]])
+    return out
+
 def calculate_risk_score(risks):
     high = len([r for r in risks if r['level'] == 'High'])
     return max(0, 100 - (high * 35))
 
+@traced()
 def calculate_experience_score(itinerary, user_interests, destination, group_type="Solo"):
     if not user_interests: return 100, "Neutral Match", "blue"
     boost = GROUP_INTELLIGENCE_SPECS.get(group_type, {}).get("pref_boost", {})
-    seen_tags = set()
+    table = city_stats_table()
+    names, tag_bits = table["names"], table["tag_bits"]
+    seen_mask = 0
+    model = is_model(itinerary)
     for d in itinerary:
-        for a in d['activities']:
-            row = ATTRACTIONS[ATTRACTIONS['name'] == a['activity']]
-            if not row.empty: seen_tags.update(row.iloc[0]['tags'])
+        for a in (d.activities if model else d['activities']):
+            known = names.get(a.activity if model else a['activity'])
+            if known: seen_mask |= known[1]
     matches = 0
     for i in user_interests:
-        if i in seen_tags: matches += (1.0 * boost.get(i, 1.0))
+        if seen_mask & tag_bits.get(i, 0): matches += (1.0 * boost.get(i, 1.0))
     score = min(100, int((matches / len(user_interests)) * 100))
     return score, "High Presence" if score > 80 else "Fair Match", "green" if score > 80 else "blue"
 
+@traced()
 def calculate_time_efficiency(itinerary, group_type="Solo"):
     if not itinerary: return 100, "Optimal", "green", 0.0
     mult = GROUP_INTELLIGENCE_SPECS.get(group_type, {}).get("time_mult", 1.0)
     daily_commute = []
+    model = is_model(itinerary)
     for d in itinerary:
-        acts = [a for a in d['activities'] if not a.get('is_meal')]
-        if not acts: 
+        if model:
+            coords = [(a.lat, a.lon) for a in d.activities if not a.is_meal]
+        else:
+            coords = [(a['lat'], a['lon']) for a in d['activities'] if not a.get('is_meal')]
+        if not coords: 
             daily_commute.append(120 * mult)
             continue
         # GEOGRAPHIC ROUTING LOGIC: Haversine distance between acts
         total_trip_mins = 90 # Start/End factor
-        for i in range(len(acts)-1):
-            total_trip_mins += haversine_travel_time(acts[i]['lat'], acts[i]['lon'], acts[i+1]['lat'], acts[i+1]['lon'])
+        for i in range(len(coords)-1):
+            (lat1, lon1), (lat2, lon2) = coords[i], coords[i+1]
+            if _unlocated(lat1, lon1) or _unlocated(lat2, lon2):
+                total_trip_mins += 15  # traffic buffer only, as in schedule_itinerary
+                continue
+            total_trip_mins += haversine_travel_time(lat1, lon1, lat2, lon2)
         daily_commute.append(total_trip_mins * mult)
     avg_h = (sum(daily_commute) / len(daily_commute)) / 60
     score = max(20, 100 - (avg_h * 15))
@@ -399,14 +1040,20 @@ def calculate_time_efficiency(itinerary, group_type="Solo"):
 def calculate_overall_score(b_s, e_s, t_s, r_s):
     return int((b_s * 0.3) + (e_s * 0.3) + (t_s * 0.2) + (r_s * 0.2))
 
-def calculate_risk_indicators(budget, budget_data, month, itinerary, avg_h, group_type, pace, students, staff):
+@traced()
+def calculate_risk_indicators(budget, budget_data, month, itinerary, avg_h, group_type, pace, students, staff, budget_risk=None):
     indicators = []
     total = budget_data.get('total_estimated', 0)
     per_student = budget_data.get('per_student_cost', 0)
     if group_type == "College Group":
         if per_student > budget: indicators.append({"icon": "💸", "title": "Budget Breach", "desc": f"Exceeds student limit by ₹{int(per_student-budget):,}."})
     elif total > budget: indicators.append({"icon": "💸", "title": "Budget Breach", "desc": f"Exceeds limit by ₹{int(total-budget):,}."})
-    multiplier = get_seasonal_multiplier(itinerary[0]['area'] if itinerary and 'area' in itinerary[0] else "Kerala", month)
+    # Point estimate fits but the simulated spread often doesn't
+    if budget_risk and not indicators and budget_risk["prob_over_budget"] >= 0.25:
+        indicators.append({"icon": "🎲", "title": "Overrun Risk", "desc": f"{int(budget_risk['prob_over_budget'] * 100)}% chance of exceeding budget (P90 ₹{budget_risk['p90']:,})."})
+    if is_model(itinerary): first_area = itinerary[0].area
+    else: first_area = itinerary[0]['area'] if itinerary and 'area' in itinerary[0] else "Kerala"
+    multiplier = get_seasonal_multiplier(first_area, month)
     if multiplier > 1.2: indicators.append({"icon": "🏔️", "title": "Peak Season", "desc": "High demand inflation detected."})
     if group_type == "College Group" and students > 0 and (staff/students) < (1/15):
         indicators.append({"icon": "👮", "title": "Safety Warning", "desc": "Staff ratio below 1:15 safety limit."})
@@ -0,0 +1,245 @@
+"""Benchmark harness for utils/analysis.py and utils/cleaning_engine.py hot paths.
+
+Synthetic catalogues are scaled up from utils/generate_test_data.py so pool
+sizes can be varied independently of the shipped dataset.
+
+    python -m utils.benchmark                     # run and compare against baseline
+    python -m utils.benchmark --save-baseline     # refresh the stored baseline
+    python -m utils.benchmark --filter itinerary  # only cases containing 'itinerary'
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from utils import analysis, cleaning_engine
+from utils.itinerary_model import itinerary_from_dicts
+from utils.generate_test_data import generate_real_raw_data
+from utils.generate_hotel_data import generate_accommodation_data
+from utils.generate_eco_data import generate_eco_data
+
+BENCH_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+SEED = 1234
+
+# --- SYNTHETIC DATA ---
+def scale_raw_attractions(src_csv, dst_csv, factor, seed=SEED):
+    # Replicate every landmark 'factor' times with jittered coordinates
+    rng = random.Random(seed)
+    with open(src_csv, newline='') as f:
+        rows = list(csv.reader(f))
+    header, body = rows[0], rows[1:]
+    with open(dst_csv, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for rep in range(factor):
+            for name, state, city, lat, lon, cat in body:
+                suffix = f" #{rep}" if rep else ""
+                writer.writerow([name + suffix, state, city,
+                                 round(float(lat) + rng.uniform(-0.05, 0.05), 4),
+                                 round(float(lon) + rng.uniform(-0.05, 0.05), 4), cat])
+    return len(body) * factor
+
+def build_synthetic_catalogue(workdir, factor):
+    random.seed(SEED)
+    base_csv = os.path.join(workdir, "raw_attractions_base.csv")
+    raw_csv = os.path.join(workdir, f"raw_attractions_x{factor}.csv")
+    out_json = os.path.join(workdir, f"attractions_x{factor}.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_real_raw_data(base_csv, seed=SEED)
+        n = scale_raw_attractions(base_csv, raw_csv, factor)
+        cleaning_engine.process_attractions(raw_csv, out_json, max_items=n)
+    return pd.read_json(out_json)
+
+@contextlib.contextmanager
+def use_catalogue(attractions_df):
+    original = analysis.ATTRACTIONS
+    analysis.ATTRACTIONS = attractions_df
+    analysis.reset_caches()
+    try:
+        yield
+    finally:
+        analysis.ATTRACTIONS = original
+        analysis.reset_caches()
+
+# --- MEASUREMENT ---
+def reseed():
+    # generate_itinerary draws from both random and numpy (DataFrame.sample)
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+def measure(fn, repeat, warmup=2):
+    for _ in range(warmup):
+        reseed()
+        fn()
+    timings = []
+    for _ in range(repeat):
+        reseed()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    reseed()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "mean_ms": round(statistics.mean(timings), 4),
+        "peak_kb": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+def build_cases(workdir, scales):
+    cases = []
+    catalogues = {f: build_synthetic_catalogue(workdir, f) for f in scales}
+    sample_city = "Munnar"
+
+    for factor, cat in catalogues.items():
+        for days in (1, 3, 7):
+            for pace in ("Relaxed", "Fast"):
+                cases.append((f"generate_itinerary[x{factor},days={days},{pace}]", cat,
+                              lambda d=days, p=pace: analysis.generate_itinerary(sample_city, ["scenic"], p, d, "Solo")))
+        cases.append((f"schedule_itinerary[x{factor},days=7]", cat,
+                      lambda: analysis.schedule_itinerary(analysis.generate_itinerary(sample_city, ["scenic"], "Fast", 7, "Solo"))))
+        cases.append((f"generate_itinerary_alternatives[x{factor},k=3]", cat,
+                      lambda: analysis.generate_itinerary_alternatives(sample_city, ["scenic"], "Fast", 3, "Solo", k=3)))
+        cases.append((f"generate_multi_city_itinerary[x{factor}]", cat,
+                      lambda: analysis.generate_multi_city_itinerary(["Munnar", "Kochi", "Jaipur"], 9, ["scenic"], "Moderate", "Family")))
+        cases.append((f"calculate_detailed_budget[x{factor}]", cat,
+                      lambda: analysis.calculate_detailed_budget(50000, "Standard", 5, "December", 12, "Couple", sample_city)))
+        cases.append((f"build_city_stats[x{factor}]", cat,
+                      lambda: analysis.build_city_stats(analysis.ATTRACTIONS, analysis.HOTELS, analysis.SEASONALITY)))
+        cases.append((f"simulate_budget_risk[x{factor},draws=5000]", cat,
+                      lambda: analysis.simulate_budget_risk(analysis.calculate_detailed_budget(50000, "Standard", 5, "December", 12, "Couple", sample_city),
+                                                            50000, sample_city, "December", 12)))
+        cases.append((f"calculate_college_group_costs[x{factor}]", cat,
+                      lambda: analysis.calculate_college_group_costs(40, 3, 1, 5, "Budget", "June", 12, 15000, sample_city)))
+
+        reseed()
+        with use_catalogue(cat):
+            itin = analysis.inject_meal_slots(analysis.generate_itinerary(sample_city, ["scenic"], "Fast", 5, "Friends"))
+        cases.append((f"optimize_budget_swaps[x{factor}]", cat,
+                      lambda i=itin: analysis.optimize_budget_swaps(i, 10000, 150, sample_city)))
+        cases.append((f"calculate_experience_score[x{factor}]", cat,
+                      lambda i=itin: analysis.calculate_experience_score(i, ["scenic", "nature"], sample_city, "Friends")))
+        cases.append((f"calculate_time_efficiency[x{factor}]", cat,
+                      lambda i=itin: analysis.calculate_time_efficiency(i, "Friends")))
+        model_itin = itinerary_from_dicts(itin)
+        cases.append((f"calculate_time_efficiency[model,x{factor}]", cat,
+                      lambda i=model_itin: analysis.calculate_time_efficiency(i, "Friends")))
+        cases.append((f"estimate_risk_factors[x{factor}]", cat,
+                      lambda: analysis.calculate_risk_score(analysis.estimate_risk_factors("Kerala", "July"))))
+        cases.append((f"estimate_risk_factors_batch[x{factor},n=1000]", cat,
+                      lambda: analysis.estimate_risk_factors_batch([sample_city, "Kerala", "Goa", "Jaisalmer"] * 250,
+                                                                   ["July", "December", "June", "May", "March"] * 200)))
+        cases.append((f"calculate_risk_indicators[x{factor}]", cat,
+                      lambda i=itin: analysis.calculate_risk_indicators(30000, {"total_estimated": 42000}, "December", i, 3.2, "Friends", "Fast", 0, 0)))
+
+    # Cleaning engine phases on the largest scale
+    factor = max(scales)
+    base_csv = os.path.join(workdir, "raw_attractions_base.csv")
+    raw_csv = os.path.join(workdir, f"raw_attractions_x{factor}.csv")
+    eco_csv = os.path.join(workdir, "raw_eco_tourism.csv")
+    hotel_json = os.path.join(workdir, "accommodation_india.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(SEED)
+        generate_eco_data(eco_csv)
+        generate_accommodation_data(hotel_json, items_per_city=5 * factor, seed=SEED)
+    n_raw = sum(1 for _ in open(raw_csv)) - 1
+
+    def quiet(fn):
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn()
+        return run
+
+    out_json = os.path.join(workdir, "bench_attractions.json")
+    cases.append((f"cleaning.process_attractions[x{factor}]", None,
+                  quiet(lambda: cleaning_engine.process_attractions(raw_csv, out_json, max_items=n_raw))))
+    cases.append((f"cleaning.process_eco_tourism[x{factor}]", None,
+                  quiet(lambda: cleaning_engine.process_eco_tourism(eco_csv, os.path.join(workdir, "eco_out.json")))))
+    cases.append((f"cleaning.process_accommodations[x{factor}]", None,
+                  quiet(lambda: cleaning_engine.process_accommodations(hotel_json, os.path.join(workdir, "prices.json"), max_cities=1000))))
+    cases.append(("cleaning.process_seasonality", None,
+                  quiet(lambda: cleaning_engine.process_seasonality(os.path.join(workdir, "seasonality.csv")))))
+    return cases
+
+def run_benchmarks(scales=(1, 4, 16), repeat=5, name_filter=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, cat, fn in build_cases(workdir, scales):
+            if name_filter and name_filter not in name:
+                continue
+            ctx = use_catalogue(cat) if cat is not None else contextlib.nullcontext()
+            with ctx:
+                results[name] = measure(fn, repeat)
+            print(f"{name:<60} {results[name]['median_ms']:>10.3f} ms {results[name]['peak_kb']:>10.1f} KiB")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "scales": list(scales),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+def compare(current, baseline, tolerance, min_delta_ms=0.1):
+    # Compare best-of-N (least noisy) and require an absolute slowdown so
+    # sub-millisecond cases do not flap on timer jitter
+    regressions = []
+    for name, cur in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = cur["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        mem_ratio = cur["peak_kb"] / base["peak_kb"] if base["peak_kb"] else 1.0
+        slower = ratio > 1 + tolerance and cur["min_ms"] - base["min_ms"] > min_delta_ms
+        if slower or mem_ratio > 1 + tolerance:
+            regressions.append((name, ratio, mem_ratio))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VoyageIQ benchmark harness")
+    parser.add_argument("--scales", default="1,4,16", help="Comma-separated catalogue replication factors")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default=None)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.35, help="Allowed slowdown before flagging (0.35 = 35%%)")
+    args = parser.parse_args()
+
+    report = run_benchmarks(tuple(int(s) for s in args.scales.split(",")), args.repeat, args.filter)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    target = args.baseline if args.save_baseline else args.output
+    with open(target, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"Wrote results to {target}")
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {int(args.tolerance*100)}%:")
+            for name, ratio, mem_ratio in regressions:
+                print(f"- {name}: time x{ratio:.2f}, memory x{mem_ratio:.2f}")
+            raise SystemExit(1)
+        print("No regressions against baseline.")
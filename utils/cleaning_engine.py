@@ -3,6 +3,11 @@ import json
 import os
 import numpy as np
 
+try:
+    from utils.place_index import STATE_MAP, build_place_index
+except ImportError:  # run as a script: python utils/cleaning_engine.py
+    from place_index import STATE_MAP, build_place_index
+
 # Rule-based logic for tagging
 CATEGORY_TAGS = {
     "Beach": ["scenic", "relaxation", "water"],
@@ -33,30 +38,13 @@ CATEGORY_DEFAULTS = {
     "Forest Trail": {"time": 4, "cost": 200, "group": True},
 }
 
-STATE_MAP = {
-    "kerala": "Kerala",
-    "kerla": "Kerala",
-    "tamilnadu": "Tamil Nadu",
-    "tamil nadu": "Tamil Nadu",
-    "karnataka": "Karnataka",
-    "goa": "Goa",
-    "maharashtra": "Maharashtra",
-    "rajasthan": "Rajasthan",
-    "madhya pradesh": "Madhya Pradesh",
-    "uttarakhand": "Uttarakhand",
-    "himachal pradesh": "Himachal Pradesh",
-    "sikkim": "Sikkim",
-    "meghalaya": "Meghalaya",
-    "jammu and kashmir": "Jammu and Kashmir",
-    "j&k": "Jammu and Kashmir",
-    "delhi": "Delhi",
-}
+# Same names and aliases analysis resolves with; trigram matching covers the misspellings the aliases miss
+STATE_INDEX = build_place_index(STATE_MAP.values())
 
 def normalize_state(state):
     if not isinstance(state, str):
         return "Unknown"
-    s = state.lower().strip()
-    return STATE_MAP.get(s, state.title().strip())
+    return STATE_INDEX.resolve(state) or state.title().strip()
 
 def process_attractions(input_csv, output_json, max_items=300):
     if not os.path.exists(input_csv):
@@ -217,6 +205,33 @@ def process_seasonality(output_csv):
         writer.writerows(data)
     print(f"Exported seasonality data to {output_csv}")
 
+def process_risk_calendar(output_csv):
+    # place (state or city) x months -> risk; city rows add to their state's rows
+    data = [
+        ["place", "months", "type", "level", "desc"],
+        ["Kerala", "Jun,Jul,Aug", "Weather", "High", "Monsoon Peak: Heavy rain hazards."],
+        ["Goa", "Jun,Jul,Aug", "Weather", "High", "Monsoon Peak: Heavy rain hazards."],
+        ["Dubai", "Jun,Jul,Aug", "Climate", "High", "Extreme Heat (>45°C). Use caution."],
+        ["Karnataka", "Jun,Jul,Aug", "Weather", "Medium", "Monsoon: coastal and ghat roads slow, some trails closed."],
+        ["Maharashtra", "Jun,Jul,Aug", "Weather", "Medium", "Monsoon: heavy rain along the Konkan and ghats."],
+        ["Uttarakhand", "Jul,Aug", "Landslide", "High", "Monsoon landslides block hill roads."],
+        ["Himachal Pradesh", "Jul,Aug", "Landslide", "High", "Monsoon landslides block hill roads."],
+        ["Sikkim", "Jun,Jul,Aug", "Landslide", "High", "Monsoon landslides block hill roads."],
+        ["Meghalaya", "Jun,Jul", "Weather", "Medium", "Very heavy rain; plan indoor buffers."],
+        ["Rajasthan", "May,Jun", "Climate", "Medium", "Desert heat above 42°C; avoid midday sightseeing."],
+        ["Jaisalmer", "May,Jun", "Climate", "High", "Extreme Heat (>45°C). Use caution."],
+        ["Delhi", "May,Jun", "Climate", "Medium", "Heatwave advisories are common."],
+        ["Delhi", "Nov,Dec", "Health", "Medium", "Poor air quality (AQI often above 300)."],
+        ["Tamil Nadu", "Oct,Nov,Dec", "Weather", "Medium", "North-east monsoon and cyclone alerts on the coast."],
+        ["Uttarakhand", "Dec,Jan", "Weather", "Medium", "Snow can close high-altitude roads."],
+    ]
+
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+        import csv
+        writer = csv.writer(f)
+        writer.writerows(data)
+    print(f"Exported risk calendar to {output_csv}")
+
 if __name__ == "__main__":
     # Phase 1: Attractions
     process_attractions("data/raw_attractions.csv", "data/attractions_india.json")
@@ -229,3 +244,6 @@ if __name__ == "__main__":
 
     # Phase 5: Seasonality
     process_seasonality("data/tourism_seasonality.csv")
+
+    # Phase 6: Risk calendar
+    process_risk_calendar("data/risk_calendar.csv")
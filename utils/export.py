@@ -0,0 +1,218 @@
+"""Columnar export of batch planner results.
+
+Flattens run_strategy output into three tables and streams them to disk in
+fixed-size chunks, so memory stays bounded by chunk_rows however many trips
+are written:
+
+    trips         one row per trip: request fields and score components
+    slots         one row per itinerary slot (trip_id, day, slot, attraction_id, ...)
+    budget_lines  one row per budget breakdown category
+
+Formats: "parquet" (one file per table, one row group per chunk; needs pyarrow),
+"csv" (one file per table) or "npz" (a directory of NumPy column chunks per
+table). "auto" picks parquet when pyarrow is installed, else csv.
+
+    python -m utils.export --trips 10000 --out exports/ --format auto
+"""
+import argparse
+import csv
+import os
+import random
+import time
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet output is optional
+    pa = pq = None
+
+from utils.analysis import ATTRACTIONS, attraction_ids
+from utils.itinerary_model import is_model
+from utils.planner import run_strategy
+
+SCHEMAS = {
+    "trips": [
+        ("trip_id", "int64"), ("destinations", "str"), ("days", "int32"), ("group_type", "str"),
+        ("travel_type", "str"), ("pace", "str"), ("month", "str"), ("budget", "float64"),
+        ("total_estimated", "float64"), ("budget_score", "int32"), ("budget_status", "str"),
+        ("exp_score", "int32"), ("time_score", "int32"), ("risk_score", "int32"), ("overall", "int32"),
+        ("avg_transit_hours", "float64"), ("activities", "int32"), ("swaps", "int32"),
+    ],
+    "slots": [
+        ("trip_id", "int64"), ("day", "int32"), ("slot", "int32"), ("attraction_id", "str"),
+        ("activity", "str"), ("time", "str"), ("cost", "float64"), ("duration", "float64"),
+        ("lat", "float64"), ("lon", "float64"), ("is_meal", "bool"), ("optimized", "bool"),
+        ("continued", "bool"), ("part", "str"), ("cluster", "int32"),
+    ],
+    "budget_lines": [("trip_id", "int64"), ("category", "str"), ("amount", "float64")],
+}
+FORMATS = ("auto", "parquet", "csv", "npz")
+
+# Fill values where a column chunk can't hold nulls (npz)
+_NPZ_FILL = {"int32": -1, "int64": -1, "float64": np.nan, "bool": False, "str": ""}
+
+class _TableWriter:
+    def __init__(self, out_dir, table, fmt):
+        self.table, self.fmt = table, fmt
+        self.columns = SCHEMAS[table]
+        self.rows = 0
+        self.chunks = 0
+        if fmt == "parquet":
+            self.path = os.path.join(out_dir, f"{table}.parquet")
+            types = {"int32": pa.int32(), "int64": pa.int64(), "float64": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+            self.schema = pa.schema([(name, types[t]) for name, t in self.columns])
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        elif fmt == "csv":
+            self.path = os.path.join(out_dir, f"{table}.csv")
+            self.file = open(self.path, "w", newline="", encoding="utf-8")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow([name for name, _ in self.columns])
+        else:
+            self.path = os.path.join(out_dir, table)
+            os.makedirs(self.path, exist_ok=True)
+
+    def write(self, buffers):
+        n = len(buffers[0])
+        if not n: return
+        if self.fmt == "parquet":
+            self.writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(buffers, self.schema)], schema=self.schema))
+        elif self.fmt == "csv":
+            self.writer.writerows(zip(*(["" if v is None else v for v in col] for col in buffers)))
+        else:
+            arrays = {}
+            for (name, t), col in zip(self.columns, buffers):
+                fill = _NPZ_FILL[t]
+                values = [fill if v is None else v for v in col]
+                arrays[name] = np.array(values, dtype=str if t == "str" else t)
+            np.savez(os.path.join(self.path, f"part-{self.chunks:05d}.npz"), **arrays)
+        self.rows += n
+        self.chunks += 1
+
+    def close(self):
+        if self.fmt == "parquet":
+            self.writer.close()
+        elif self.fmt == "csv":
+            self.file.close()
+
+class TripExporter:
+    """Stream trips into columnar tables. Use as a context manager.
+
+    with TripExporter("exports/", fmt="auto") as out:
+        out.add_trip(trip_id, params, results)   # results from planner.run_strategy
+    """
+
+    def __init__(self, out_dir, fmt="auto", chunk_rows=100_000):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}, expected one of {FORMATS}")
+        if fmt == "auto":
+            fmt = "parquet" if pa is not None else "csv"
+        if fmt == "parquet" and pa is None:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use fmt='csv' or 'npz'")
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir, self.fmt, self.chunk_rows = out_dir, fmt, chunk_rows
+        self.writers = {t: _TableWriter(out_dir, t, fmt) for t in SCHEMAS}
+        self.buffers = {t: [[] for _ in SCHEMAS[t]] for t in SCHEMAS}
+        self.ids = attraction_ids()
+
+    def _append(self, table, row):
+        buf = self.buffers[table]
+        for col, value in zip(buf, row):
+            col.append(value)
+        if len(buf[0]) >= self.chunk_rows:
+            self._flush(table)
+
+    def _flush(self, table):
+        self.writers[table].write(self.buffers[table])
+        self.buffers[table] = [[] for _ in SCHEMAS[table]]
+
+    def add_trip(self, trip_id, params, results):
+        budget_data = results["budget_data"]
+        self._append("trips", (
+            trip_id, "|".join(params["destinations"]), params["days"], params.get("group_type"),
+            params.get("travel_type"), params.get("pace"), params.get("month"), params.get("budget"),
+            budget_data.get("total_estimated"), budget_data.get("score"), budget_data.get("status"),
+            results["exp_score"], results["time_score"], results["risk_score"], results["overall"],
+            results["avg_h"], results["total_activities"], len(results["swaps"]),
+        ))
+        for category, amount in budget_data.get("breakdown", {}).items():
+            self._append("budget_lines", (trip_id, category, amount))
+        self.add_itinerary(trip_id, results["itinerary"])
+
+    def add_itinerary(self, trip_id, itinerary):
+        model = is_model(itinerary)
+        for day in itinerary:
+            if model:
+                day_no, cluster = day.day, day.cluster
+                slots = [(s.activity, s.time, s.cost, s.duration, s.lat, s.lon, s.is_meal, s.optimized, s.continued, s.part) for s in day.activities]
+            else:
+                day_no, cluster = day['day'], day.get('cluster')
+                slots = [(s['activity'], s['time'], s.get('cost', 0), s.get('duration', 0), s.get('lat'), s.get('lon'),
+                          bool(s.get('is_meal')), bool(s.get('optimized')), bool(s.get('continued')), s.get('part')) for s in day['activities']]
+            for idx, (activity, time_slot, cost, duration, lat, lon, is_meal, optimized, continued, part) in enumerate(slots):
+                self._append("slots", (
+                    trip_id, day_no, idx, None if is_meal else self.ids.get(activity), activity, time_slot,
+                    cost, duration, lat, lon, is_meal, optimized, continued, part, cluster,
+                ))
+
+    def close(self):
+        for table in SCHEMAS:
+            self._flush(table)
+            self.writers[table].close()
+        return {t: {"path": w.path, "rows": w.rows, "chunks": w.chunks} for t, w in self.writers.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.summary = self.close()
+
+# --- BATCH DRIVER ---
+def random_trip_params(rng, cities):
+    days = rng.randint(1, 7)
+    group_type = rng.choice(["Solo", "Couple", "Friends", "Family", "College Group"])
+    destinations = rng.sample(cities, 2) if rng.random() < 0.2 else [rng.choice(cities)]
+    return {
+        "destinations": destinations, "days": max(days, len(destinations)), "group_type": group_type,
+        "interests": rng.sample(["scenic", "culture", "adventure", "relaxation", "religious", "shopping"], 2),
+        "pace": rng.choice(["Relaxed", "Moderate", "Fast"]),
+        "travel_type": rng.choice(["Budget", "Standard", "Luxury"]),
+        "month": rng.choice(["January", "March", "May", "July", "October", "December"]),
+        "budget": rng.choice([20000, 50000, 100000, 250000]),
+        "students": 40 if group_type == "College Group" else 0,
+        "staff": 3 if group_type == "College Group" else 0,
+        "drivers": 1 if group_type == "College Group" else 0,
+    }
+
+def export_batch(trips, out_dir, fmt="auto", chunk_rows=100_000):
+    """trips: iterable of (trip_id, params). Plans each trip and streams it out; returns the table summary."""
+    with TripExporter(out_dir, fmt, chunk_rows) as out:
+        for trip_id, params in trips:
+            results, _, _ = run_strategy(params)
+            out.add_trip(trip_id, params, results)
+    return out.summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan random trips and export them as columnar tables")
+    parser.add_argument("--trips", type=int, default=1000)
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--format", choices=FORMATS, default="auto")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    cities = sorted(ATTRACTIONS['city'].unique().tolist())
+    trips = ((i, random_trip_params(rng, cities)) for i in range(args.trips))
+    start = time.perf_counter()
+    summary = export_batch(trips, args.out, args.format, args.chunk_rows)
+    for table, info in summary.items():
+        print(f"{table:<13} {info['rows']:>10,} rows in {info['chunks']} chunk(s) -> {info['path']}")
+    print(f"Exported {args.trips:,} trips in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import csv
+import random
 
 def generate_eco_data(output_file):
     eco_destinations = [
@@ -26,5 +27,22 @@ def generate_eco_data(output_file):
         writer.writerows(eco_destinations)
     print(f"Generated eco-tourism data in {output_file}")
 
+ECO_KINDS = [("Trek", 24, 72), ("Nature Walk", 2, 4), ("Safari", 3, 12), ("Rainforest Trail", 4, 8), ("Sacred Grove", 1, 3)]
+
+def generate_synthetic_eco_data(output_file, n_rows, cities, seed=None, chunk_size=50_000):
+    # cities: list of (city, state, ...); the city doubles as the district
+    rng = random.Random(seed)
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "State", "District", "Entry Fee", "Duration"])
+        for start in range(0, n_rows, chunk_size):
+            rows = []
+            for i in range(start, min(n_rows, start + chunk_size)):
+                city, state, *_ = rng.choice(cities)
+                kind, lo, hi = rng.choice(ECO_KINDS)
+                rows.append([f"{city} {kind} {i}", state, city, rng.choice([50, 100, 150, 200, 300, 500, 1500]), rng.randint(lo, hi)])
+            writer.writerows(rows)
+    print(f"Generated {n_rows} synthetic eco-tourism rows in {output_file}")
+
 if __name__ == "__main__":
     generate_eco_data("data/raw_eco_tourism.csv")
@@ -10,28 +10,47 @@ cities_with_states = {
 
 hotel_types = ["Luxury Hotel", "Boutique Hotel", "Guest House", "Homestay", "Resort", "Budget Hotel"]
 
-def generate_accommodation_data(output_file, items_per_city=5):
+AMENITIES = ["WiFi", "Pool", "Breakfast", "Parking", "AC", "Gym"]
+
+def make_hotel(rng, city, state, i, hotel_id=None):
+    h_type = rng.choice(hotel_types)
+    base_price = rng.randint(1500, 15000) if "Luxury" in h_type or "Resort" in h_type else rng.randint(500, 3000)
+    return {
+        "hotel_id": hotel_id or f"hot_{city[:3].lower()}_{i:02d}",
+        "name": f"{city} {h_type} {i+1}",
+        "city": city,
+        "state": state,
+        "type": h_type,
+        "avg_price_per_night": base_price,
+        "rating": round(rng.uniform(3.5, 4.9), 1),
+        "amenities": rng.sample(AMENITIES, k=rng.randint(2, 4)),
+        "group_friendly": True if h_type in ["Resort", "Guest House", "Homestay"] else rng.choice([True, False])
+    }
+
+def generate_accommodation_data(output_file, items_per_city=5, seed=None):
+    rng = random.Random(seed)
     accommodations = []
     for city, state in cities_with_states.items():
         for i in range(items_per_city):
-            h_type = random.choice(hotel_types)
-            base_price = random.randint(1500, 15000) if "Luxury" in h_type or "Resort" in h_type else random.randint(500, 3000)
-            
-            accommodations.append({
-                "hotel_id": f"hot_{city[:3].lower()}_{i:02d}",
-                "name": f"{city} {h_type} {i+1}",
-                "city": city,
-                "state": state,
-                "type": h_type,
-                "avg_price_per_night": base_price,
-                "rating": round(random.uniform(3.5, 4.9), 1),
-                "amenities": random.sample(["WiFi", "Pool", "Breakfast", "Parking", "AC", "Gym"], k=random.randint(2, 4)),
-                "group_friendly": True if h_type in ["Resort", "Guest House", "Homestay"] else random.choice([True, False])
-            })
+            accommodations.append(make_hotel(rng, city, state, i))
     
     with open(output_file, 'w') as f:
         json.dump(accommodations, f, indent=4)
     print(f"Generated {len(accommodations)} accommodation entries in {output_file}")
 
+def generate_synthetic_accommodation_data(output_file, cities, items_per_city=5, seed=None):
+    # Streams a JSON array one listing at a time; cities: list of (city, state, ...)
+    rng = random.Random(seed)
+    count = 0
+    with open(output_file, 'w') as f:
+        f.write("[\n")
+        for c_idx, (city, state, *_) in enumerate(cities):
+            for i in range(items_per_city):
+                hotel = make_hotel(rng, city, state, i, hotel_id=f"hot_{c_idx:05d}_{i:04d}")
+                f.write((",\n" if count else "") + json.dumps(hotel))
+                count += 1
+        f.write("\n]\n")
+    print(f"Generated {count} synthetic accommodation entries in {output_file}")
+
 if __name__ == "__main__":
-    generate_accommodation_data("data/accommodation_india.json")
+    generate_accommodation_data("data/accommodation_india.json", seed=42)
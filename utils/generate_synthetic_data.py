@@ -0,0 +1,125 @@
+"""Seeded, scalable synthetic catalogue for load and benchmark testing.
+
+Builds one shared geography (states -> cities) and streams matching raw
+attractions, eco-tourism rows, hotel listings and seasonality rows. Unless
+--raw-only is given, it also writes the engine-format attractions, hotel
+price tiers and vehicle table, so utils/analysis.py can load the directory
+directly (load_data(out_dir), or utils.warmup --data-dir).
+
+    python -m utils.generate_synthetic_data --attractions 1000000 --cities 2000 \\
+        --hotels-per-city 500 --out data/synthetic --seed 7
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+
+from utils.cleaning_engine import CATEGORY_TAGS, CATEGORY_DEFAULTS, process_accommodations
+from utils.generate_test_data import (
+    RAW_CATEGORIES, PLACE_WORDS, iter_synthetic_attraction_chunks, generate_synthetic_raw_data
+)
+from utils.generate_hotel_data import generate_synthetic_accommodation_data
+from utils.generate_eco_data import generate_synthetic_eco_data
+
+BASE_STATES = [
+    ("Kerala", 10.0, 76.5), ("Goa", 15.4, 74.0), ("Rajasthan", 26.5, 73.5), ("Karnataka", 14.0, 76.0),
+    ("Tamil Nadu", 11.0, 78.5), ("Uttarakhand", 30.0, 79.0), ("Himachal Pradesh", 31.8, 77.2),
+    ("Maharashtra", 19.0, 75.5), ("Sikkim", 27.5, 88.5), ("Meghalaya", 25.5, 91.3),
+    ("Uttar Pradesh", 27.0, 80.9), ("Delhi", 28.6, 77.2), ("Madhya Pradesh", 23.5, 78.5),
+    ("West Bengal", 23.0, 87.8), ("Punjab", 31.0, 75.4), ("Gujarat", 22.5, 71.5),
+    ("Odisha", 20.5, 84.5), ("Assam", 26.2, 92.9), ("Andhra Pradesh", 16.0, 80.0),
+    ("Telangana", 17.8, 79.0), ("Jammu and Kashmir", 33.7, 75.0), ("Bihar", 25.6, 85.6),
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+# Vehicle types aren't per city; engine-ready directories reuse the shipped table
+VEHICLES_JSON = os.path.join(os.path.dirname(__file__), "..", "data", "transport_vehicles.json")
+
+def build_geography(n_cities, n_states=None, seed=None):
+    # Returns [(city, state, lat, lon)]; extra states beyond BASE_STATES get synthetic names
+    rng = random.Random(seed)
+    n_states = n_states or min(len(BASE_STATES), n_cities)
+    states = []
+    for s in range(n_states):
+        if s < len(BASE_STATES):
+            states.append(BASE_STATES[s])
+        else:
+            states.append((f"Synthetic State {s:04d}", rng.uniform(8.5, 32.5), rng.uniform(70.0, 92.0)))
+
+    cities = []
+    for c in range(n_cities):
+        state, s_lat, s_lon = states[c % n_states]
+        cities.append((f"{state} City {c:05d}", state, round(s_lat + rng.uniform(-1.5, 1.5), 4), round(s_lon + rng.uniform(-1.5, 1.5), 4)))
+    return cities
+
+def generate_synthetic_seasonality(output_csv, cities, seed=None):
+    rng = random.Random(seed)
+    states = sorted({state for _, state, *_ in cities})
+    with open(output_csv, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["state", "peak_months", "off_months", "peak_multiplier", "off_multiplier"])
+        for state in states:
+            months = rng.sample(MONTHS, 6)
+            writer.writerow([state, ",".join(months[:4]), ",".join(months[4:]),
+                             round(rng.uniform(1.3, 1.5), 2), round(rng.uniform(0.8, 0.9), 2)])
+    print(f"Exported seasonality for {len(states)} states to {output_csv}")
+
+def generate_engine_attractions(output_json, n_attractions, cities, seed=None, chunk_size=100_000):
+    # Same record layout cleaning_engine.process_attractions emits, streamed as a JSON array
+    count = 0
+    with open(output_json, 'w') as f:
+        f.write("[\n")
+        for chunk in iter_synthetic_attraction_chunks(n_attractions, cities, seed, chunk_size):
+            lines = []
+            for j in range(len(chunk["city_idx"])):
+                city, state, lat, lon = cities[chunk["city_idx"][j]]
+                cat = RAW_CATEGORIES[chunk["category_idx"][j]]
+                defaults = CATEGORY_DEFAULTS.get(cat, {"time": 2, "cost": 200, "group": True})
+                i = chunk["start"] + j
+                lines.append(json.dumps({
+                    "id": f"syn_{i:08d}",
+                    "name": f"{city} {PLACE_WORDS[chunk['word_idx'][j]]} {i}",
+                    "state": state,
+                    "city": city,
+                    "area": city,
+                    "latitude": round(lat + float(chunk["dlat"][j]), 4),
+                    "longitude": round(lon + float(chunk["dlon"][j]), 4),
+                    "tags": CATEGORY_TAGS.get(cat, ["general"]),
+                    "avg_time_hours": defaults["time"],
+                    "avg_cost_per_person": defaults["cost"],
+                    "group_friendly": defaults["group"],
+                    "popularity_score": 80 if cat in ["Temple", "Beach"] else 70
+                }))
+            f.write((",\n" if count else "") + ",\n".join(lines))
+            count += len(lines)
+        f.write("\n]\n")
+    print(f"Exported {count} engine-format attractions to {output_json}")
+
+def generate_all(out_dir, n_attractions, n_cities, hotels_per_city, n_eco=0, n_states=None, seed=42, engine_format=True):
+    os.makedirs(out_dir, exist_ok=True)
+    cities = build_geography(n_cities, n_states, seed)
+    generate_synthetic_raw_data(os.path.join(out_dir, "raw_attractions.csv"), n_attractions, cities, seed)
+    if n_eco:
+        generate_synthetic_eco_data(os.path.join(out_dir, "raw_eco_tourism.csv"), n_eco, cities, seed)
+    generate_synthetic_accommodation_data(os.path.join(out_dir, "accommodation_india.json"), cities, hotels_per_city, seed)
+    generate_synthetic_seasonality(os.path.join(out_dir, "tourism_seasonality.csv"), cities, seed)
+    if engine_format:
+        generate_engine_attractions(os.path.join(out_dir, "attractions_india.json"), n_attractions, cities, seed)
+        process_accommodations(os.path.join(out_dir, "accommodation_india.json"),
+                               os.path.join(out_dir, "hotel_prices_by_city.json"), max_cities=n_cities)
+        shutil.copy(VEHICLES_JSON, out_dir)
+    return cities
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic VoyageIQ catalogue")
+    parser.add_argument("--out", default="data/synthetic")
+    parser.add_argument("--attractions", type=int, default=10_000)
+    parser.add_argument("--cities", type=int, default=500)
+    parser.add_argument("--states", type=int, default=None)
+    parser.add_argument("--hotels-per-city", type=int, default=20)
+    parser.add_argument("--eco", type=int, default=0, help="Synthetic eco-tourism rows")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--raw-only", action="store_true", help="Skip the engine-format attractions JSON")
+    args = parser.parse_args()
+    generate_all(args.out, args.attractions, args.cities, args.hotels_per_city, args.eco, args.states, args.seed, not args.raw_only)
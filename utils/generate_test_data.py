@@ -1,7 +1,9 @@
 import csv
 import random
+import numpy as np
 
-def generate_real_raw_data(output_file):
+def generate_real_raw_data(output_file, seed=None):
+    rng = random.Random(seed)
     # Expanded list of real Indian tourist attractions
     # We ensure each city has at least 15-20 attractions to avoid repeats in 5-day itineraries
     data_map = {
@@ -56,12 +58,48 @@ def generate_real_raw_data(output_file):
                 base_lat, base_lon = city_coords.get(city, (15.0, 75.0))
                 for place in places:
                     # Perturb lat/lon slightly for clusters
-                    lat = round(base_lat + random.uniform(-0.05, 0.05), 4)
-                    lon = round(base_lon + random.uniform(-0.05, 0.05), 4)
-                    cat = random.choice(categories)
+                    lat = round(base_lat + rng.uniform(-0.05, 0.05), 4)
+                    lon = round(base_lon + rng.uniform(-0.05, 0.05), 4)
+                    cat = rng.choice(categories)
                     writer.writerow([place, state, city, lat, lon, cat])
     
     print(f"Exported expanded real Indian landmarks to {output_file}")
 
+RAW_CATEGORIES = ["Beach", "Temple", "Hill Station", "National Park", "Waterfall", "Fort", "Palace", "Museum", "Cave", "Lake", "Forest Trail"]
+PLACE_WORDS = ["Point", "Falls", "Lake", "Fort", "Temple", "Garden", "Viewpoint", "Trail", "Palace", "Beach", "Caves", "Market"]
+
+def iter_synthetic_attraction_chunks(n_attractions, cities, seed=None, chunk_size=100_000):
+    # Yields column chunks so callers can stream rows without holding the catalogue
+    # cities: list of (city, state, lat, lon)
+    rng = np.random.default_rng(seed)
+    n_cities = len(cities)
+    for start in range(0, n_attractions, chunk_size):
+        n = min(chunk_size, n_attractions - start)
+        yield {
+            "start": start,
+            "city_idx": rng.integers(0, n_cities, n),
+            "dlat": rng.uniform(-0.05, 0.05, n),
+            "dlon": rng.uniform(-0.05, 0.05, n),
+            "category_idx": rng.integers(0, len(RAW_CATEGORIES), n),
+            "word_idx": rng.integers(0, len(PLACE_WORDS), n),
+        }
+
+def generate_synthetic_raw_data(output_file, n_attractions, cities, seed=None, chunk_size=100_000):
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Place Name", "State", "City", "Latitude", "Longitude", "Category"])
+        for chunk in iter_synthetic_attraction_chunks(n_attractions, cities, seed, chunk_size):
+            rows = []
+            for j in range(len(chunk["city_idx"])):
+                city, state, lat, lon = cities[chunk["city_idx"][j]]
+                rows.append([
+                    f"{city} {PLACE_WORDS[chunk['word_idx'][j]]} {chunk['start'] + j}", state, city,
+                    round(lat + chunk["dlat"][j], 4), round(lon + chunk["dlon"][j], 4),
+                    RAW_CATEGORIES[chunk["category_idx"][j]]
+                ])
+            writer.writerows(rows)
+
+    print(f"Exported {n_attractions} synthetic landmarks across {len(cities)} cities to {output_file}")
+
 if __name__ == "__main__":
-    generate_real_raw_data("data/raw_attractions.csv")
+    generate_real_raw_data("data/raw_attractions.csv", seed=42)
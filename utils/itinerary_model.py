@@ -0,0 +1,63 @@
+"""Compact itinerary model.
+
+Slotted dataclasses replace the nested day/activity dicts for batch quoting,
+where millions of slots are held at once. Conversion helpers keep the dict
+format (what app.py and the API render) as the interchange shape.
+"""
+from dataclasses import dataclass, field
+
+@dataclass(slots=True)
+class Slot:
+    time: str
+    activity: str
+    cost: float
+    duration: float
+    lat: float | None = None
+    lon: float | None = None
+    is_meal: bool = False
+    optimized: bool = False
+    continued: bool = False
+    part: str | None = None  # multi-day span from the scheduler: "1/2", "2/2", or "full"
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['time'], d['activity'], d.get('cost', 0), d.get('duration', 0),
+                   d.get('lat'), d.get('lon'), bool(d.get('is_meal', False)), bool(d.get('optimized', False)),
+                   bool(d.get('continued', False)), d.get('part'))
+
+    def to_dict(self):
+        d = {"time": self.time, "activity": self.activity, "cost": self.cost, "duration": self.duration}
+        if self.optimized: d["optimized"] = True
+        if self.lat is not None: d["lat"] = self.lat
+        if self.lon is not None: d["lon"] = self.lon
+        if self.is_meal: d["is_meal"] = True
+        if self.continued: d["continued"] = True
+        if self.part is not None: d["part"] = self.part
+        return d
+
+@dataclass(slots=True)
+class Day:
+    day: int
+    area: str
+    activities: list = field(default_factory=list)
+    transit_info: str | None = None
+    cluster: int | None = None
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['day'], d['area'], [Slot.from_dict(a) for a in d['activities']], d.get('transit_info'), d.get('cluster'))
+
+    def to_dict(self):
+        d = {"day": self.day, "area": self.area, "activities": [a.to_dict() for a in self.activities]}
+        if self.cluster is not None: d["cluster"] = self.cluster
+        if self.transit_info is not None: d["transit_info"] = self.transit_info
+        return d
+
+def is_model(itinerary):
+    return bool(itinerary) and isinstance(itinerary[0], Day)
+
+def itinerary_from_dicts(itinerary):
+    return [d if isinstance(d, Day) else Day.from_dict(d) for d in itinerary]
+
+def itinerary_to_dicts(itinerary):
+    return [d.to_dict() if isinstance(d, Day) else d for d in itinerary]
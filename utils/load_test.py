@@ -0,0 +1,101 @@
+"""Local load test for api_server.py.
+
+Start the server first (python api_server.py), then:
+    python utils/load_test.py --requests 2000 --concurrency 50
+Reports p50/p99 latency and throughput per endpoint.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+CITIES = ["Munnar", "Kochi", "Alleppey", "Jaipur", "Udaipur", "Ooty", "Hampi", "Mysore"]
+MONTHS = ["January", "April", "June", "July", "October", "December"]
+
+def build_request(rng, distinct):
+    # A small 'distinct' pool makes identical in-flight bodies likely, exercising coalescing
+    r = random.Random(rng.randrange(distinct)) if distinct else rng
+    city = r.choice(CITIES)
+    kind = r.choice(["/itinerary", "/budget", "/score"])
+    if kind == "/itinerary":
+        body = {"destination": city, "interests": r.sample(["Scenic", "Culture", "Adventure", "Relaxation"], 2),
+                "pace": r.choice(["Relaxed", "Moderate", "Fast"]), "days": r.randint(1, 7), "group_type": "Solo"}
+    elif kind == "/budget":
+        body = {"budget": r.choice([20000, 50000, 100000]), "travel_type": r.choice(["Budget", "Standard", "Luxury"]),
+                "days": r.randint(1, 7), "month": r.choice(MONTHS), "activity_count": r.randint(3, 20),
+                "group_type": r.choice(["Solo", "Couple", "Family"]), "destination": city}
+    else:
+        body = {"itinerary": [{"day": 1, "area": city, "activities": [
+                    {"time": "09:00 AM - 11:30 AM", "activity": "Tea Museum", "cost": 200, "duration": 2, "lat": 10.1, "lon": 77.05},
+                    {"time": "11:45 AM - 01:00 PM", "activity": "Echo Point", "cost": 100, "duration": 1.5, "lat": 10.12, "lon": 77.08}]}],
+                "interests": ["Scenic"], "destination": city, "month": r.choice(MONTHS), "budget": 50000,
+                "travel_type": "Standard", "days": 1, "group_type": "Solo"}
+    return kind, json.dumps(body).encode("utf-8")
+
+async def worker(host, port, queue, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                path, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            status = int(status_line.split()[1])
+            results.append((path, status, time.perf_counter() - start))
+    finally:
+        writer.close()
+
+def percentile(sorted_vals, q):
+    if not sorted_vals: return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+def report(results, elapsed):
+    print(f"{'endpoint':<12}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    groups = {}
+    for path, status, latency in results:
+        groups.setdefault(path, []).append((status, latency))
+    groups["ALL"] = [(s, l) for _, s, l in results]
+    for path, rows in groups.items():
+        lat = sorted(l for _, l in rows)
+        errors = len([s for s, _ in rows if s >= 400])
+        print(f"{path:<12}{len(rows):>8}{errors:>8}{percentile(lat, 0.50)*1000:>10.1f}{percentile(lat, 0.99)*1000:>10.1f}")
+    print(f"Throughput: {len(results) / elapsed:.1f} req/s over {elapsed:.2f}s")
+
+async def run(args):
+    rng = random.Random(args.seed)
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(build_request(rng, args.distinct))
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, queue, results) for _ in range(args.concurrency)))
+    report(results, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VoyageIQ API load test")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=0, help="Limit to N distinct bodies (0 = all random)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args))
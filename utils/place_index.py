@@ -0,0 +1,175 @@
+"""Fuzzy place-name resolution.
+
+A PlaceIndex maps free-text city/state input to canonical catalogue names:
+normalised exact match and known aliases first (dict lookups), then trigram
+similarity over an inverted index for misspellings. Queries stay well under a
+millisecond for tens of thousands of names.
+
+    index = PlaceIndex(["Alleppey", "Bangalore", "Kerala"] + MAJOR_CITIES)
+    index.resolve("Alappuzha")   # "Alleppey"  (alias)
+    index.resolve("Kerla")       # "Kerala"    (trigram)
+    index.resolve("Atlantis")    # None
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+# Official / local / common-misspelling names -> catalogue name
+PLACE_ALIASES = {
+    # Cities
+    "alappuzha": "Alleppey",
+    "bengaluru": "Bangalore",
+    "cochin": "Kochi",
+    "ernakulam": "Kochi",
+    "mysuru": "Mysore",
+    "ootacamund": "Ooty",
+    "udhagamandalam": "Ooty",
+    "thiruvananthapuram": "Trivandrum",
+    "bombay": "Mumbai",
+    "madras": "Chennai",
+    "calcutta": "Kolkata",
+    "kolkatta": "Kolkata",
+    "pondicherry": "Puducherry",
+    "pondy": "Puducherry",
+    "benaras": "Varanasi",
+    "banaras": "Varanasi",
+    "kashi": "Varanasi",
+    "gurgaon": "Gurugram",
+    "simla": "Shimla",
+    "darjiling": "Darjeeling",
+    "kodai": "Kodaikanal",
+    # States
+    "kerla": "Kerala",
+    "tamilnadu": "Tamil Nadu",
+    "tn": "Tamil Nadu",
+    "j&k": "Jammu and Kashmir",
+    "j and k": "Jammu and Kashmir",
+    "jammu kashmir": "Jammu and Kashmir",
+    "himachal": "Himachal Pradesh",
+    "hp": "Himachal Pradesh",
+    "mp": "Madhya Pradesh",
+    "up": "Uttar Pradesh",
+    "uttaranchal": "Uttarakhand",
+    "orissa": "Odisha",
+    "new delhi": "Delhi",
+    "ncr": "Delhi",
+    "mamallapuram": "Mahabalipuram",
+    "chikmagalur": "Chikkamagaluru",
+}
+
+# Raw-data state spellings seen by the ETL (lower-case keys); merged with PLACE_ALIASES in build_place_index
+STATE_MAP = {
+    "kerala": "Kerala",
+    "kerla": "Kerala",
+    "tamilnadu": "Tamil Nadu",
+    "tamil nadu": "Tamil Nadu",
+    "karnataka": "Karnataka",
+    "goa": "Goa",
+    "maharashtra": "Maharashtra",
+    "rajasthan": "Rajasthan",
+    "madhya pradesh": "Madhya Pradesh",
+    "uttarakhand": "Uttarakhand",
+    "himachal pradesh": "Himachal Pradesh",
+    "sikkim": "Sikkim",
+    "meghalaya": "Meghalaya",
+    "jammu and kashmir": "Jammu and Kashmir",
+    "j&k": "Jammu and Kashmir",
+    "delhi": "Delhi",
+}
+
+# Reference vocabulary: resolving "Andhra Pradesh" or "Mangalore" to itself (and then finding no
+# catalogue rows) beats a confident trigram match to "Madhya Pradesh" or "Bangalore"
+INDIAN_STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", "Gujarat", "Haryana",
+    "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur",
+    "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana",
+    "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal", "Andaman and Nicobar Islands", "Chandigarh",
+    "Dadra and Nagar Haveli and Daman and Diu", "Delhi", "Jammu and Kashmir", "Ladakh", "Lakshadweep", "Puducherry",
+]
+MAJOR_CITIES = [
+    "Agra", "Ahmedabad", "Ajmer", "Alibaug", "Allahabad", "Alleppey", "Almora", "Amritsar", "Auli",
+    "Aurangabad", "Bangalore", "Bhopal", "Bhubaneswar", "Bikaner", "Chandigarh", "Chennai", "Chikkamagaluru",
+    "Coimbatore", "Coorg", "Darjeeling", "Dehradun", "Delhi", "Dharamshala", "Dwarka", "Gangtok", "Gokarna",
+    "Gurugram", "Guwahati", "Gwalior", "Hampi", "Haridwar", "Hyderabad", "Indore", "Jabalpur", "Jaipur",
+    "Jaisalmer", "Jammu", "Jodhpur", "Kanchipuram", "Kanpur", "Kanyakumari", "Kasauli", "Khajuraho", "Kochi",
+    "Kodaikanal", "Kolkata", "Kota", "Kovalam", "Kozhikode", "Leh", "Lonavala", "Lucknow", "Madikeri",
+    "Madurai", "Mahabaleshwar", "Mahabalipuram", "Manali", "Mangalore", "Manipal", "Matheran", "Mount Abu",
+    "Mumbai", "Munnar", "Mussoorie", "Mysore", "Nagpur", "Nainital", "Nashik", "Ooty", "Patna", "Puducherry",
+    "Pune", "Puri", "Pushkar", "Raipur", "Rajkot", "Rameswaram", "Ranchi", "Ranikhet", "Rishikesh", "Shillong",
+    "Shimla", "Shirdi", "Somnath", "Srinagar", "Surat", "Thanjavur", "Thekkady", "Thrissur", "Tirupati",
+    "Trivandrum", "Udaipur", "Udupi", "Vadodara", "Varanasi", "Varkala", "Vellore", "Vijayawada",
+    "Visakhapatnam", "Wayanad",
+]
+
+MIN_SIMILARITY = 0.5
+
+def build_place_index(names=()):
+    """The index both analysis and the ETL resolve through: `names` plus the
+    reference lists, with one alias table."""
+    return PlaceIndex(list(names) + INDIAN_STATES + MAJOR_CITIES, aliases=PLACE_ALIASES | STATE_MAP)
+
+def normalize_name(name):
+    # Case, accents, punctuation and spacing insensitive; '&' reads as 'and'
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    text = text.lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlaceIndex:
+    def __init__(self, names, aliases=PLACE_ALIASES, min_similarity=MIN_SIMILARITY):
+        self.names = list(dict.fromkeys(n for n in names if isinstance(n, str) and n.strip()))
+        self.min_similarity = min_similarity
+        self.known = set(self.names)
+        self.exact = {}
+        for name in self.names:
+            key = normalize_name(name)
+            self.exact.setdefault(key, name)
+            self.exact.setdefault(key.replace(" ", ""), name)
+        canonical = {normalize_name(n): n for n in self.names}
+        for alias, target in aliases.items():
+            # Only aliases whose target is in this index; a catalogue name always wins over an alias
+            name = canonical.get(normalize_name(target))
+            if name is not None:
+                self.exact.setdefault(normalize_name(alias), name)
+                self.exact.setdefault(normalize_name(alias).replace(" ", ""), name)
+
+        postings = {}
+        self.sizes = np.empty(len(self.names), dtype=np.int32)
+        for i, name in enumerate(self.names):
+            grams = trigrams(normalize_name(name))
+            self.sizes[i] = len(grams)
+            for g in grams: postings.setdefault(g, []).append(i)
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def match(self, query, limit=5):
+        """Top `limit` (name, similarity) pairs by trigram Dice coefficient."""
+        grams = trigrams(normalize_name(query))
+        hits = [self.postings[g] for g in grams if g in self.postings]
+        if not hits: return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        scores = 2 * shared / (self.sizes + len(grams))
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        order = order[shared[order] > 0]
+        return [(self.names[i], round(float(scores[i]), 3)) for i in order]
+
+    def resolve(self, query):
+        """Canonical name for `query`, or None when nothing is similar enough."""
+        if not isinstance(query, str): return None
+        if query in self.known: return query
+        key = normalize_name(query)
+        if not key: return None
+        name = self.exact.get(key) or self.exact.get(key.replace(" ", ""))
+        if name is not None: return name
+        best = self.match(key, limit=1)
+        return best[0][0] if best and best[0][1] >= self.min_similarity else None
@@ -0,0 +1,152 @@
+"""Incremental strategy planner.
+
+Runs the app.py pipeline (itinerary -> schedule/meals -> budget -> budget risk ->
+swaps -> risks -> scores -> indicators) as stages with declared inputs. Each stage is recomputed
+only when one of its parameters or an upstream stage output changed, so
+tweaking the month or budget re-prices the existing itinerary instead of
+regenerating it.
+"""
+import copy
+
+from utils.analysis import (
+    calculate_detailed_budget,
+    calculate_college_group_costs,
+    estimate_risk_factors,
+    generate_itinerary,
+    generate_multi_city_itinerary,
+    schedule_itinerary,
+    optimize_budget_swaps,
+    calculate_experience_score,
+    calculate_time_efficiency,
+    calculate_risk_score,
+    calculate_overall_score,
+    calculate_risk_indicators,
+    simulate_budget_risk,
+)
+from utils.profiling import span, count
+
+# stage -> (parameter names, upstream stages)
+STAGES = {
+    "itinerary": (("destinations", "interests", "pace", "days", "group_type"), ()),
+    "budget": (("group_type", "travel_type", "month", "budget", "days", "students", "staff", "drivers", "primary_dest"), ("itinerary",)),
+    "budget_risk": (("budget", "month", "primary_dest"), ("itinerary", "budget")),
+    "swaps": (("travel_type", "budget", "primary_dest"), ("itinerary", "budget")),
+    "risks": (("primary_dest", "month"), ()),
+    "experience": (("interests", "primary_dest", "group_type"), ("swaps",)),
+    "time": (("group_type",), ("swaps",)),
+    "summary": (("budget", "month", "group_type", "pace", "students", "staff"), ("budget", "budget_risk", "swaps", "risks", "experience", "time")),
+}
+
+def _total_activities(itinerary):
+    # Continuation days of multi-day activities are not separate bookings
+    return sum(len([a for a in d['activities'] if not a.get('is_meal') and not a.get('continued')]) for d in itinerary)
+
+def _run_itinerary(p, up):
+    if len(p["destinations"]) > 1:
+        itinerary = generate_multi_city_itinerary(p["destinations"], p["days"], p["interests"], p["pace"], p["group_type"])
+    else:
+        itinerary = generate_itinerary(p["destinations"][0], p["interests"], p["pace"], p["days"], p["group_type"])
+    return schedule_itinerary(itinerary)
+
+def _run_budget(p, up):
+    total = _total_activities(up["itinerary"])
+    if p["group_type"] == "College Group":
+        return calculate_college_group_costs(p["students"], p["staff"], p["drivers"], p["days"], p["travel_type"], p["month"], total, p["budget"], p["primary_dest"])
+    return calculate_detailed_budget(p["budget"], p["travel_type"], p["days"], p["month"], total, p["group_type"], p["primary_dest"])
+
+def _run_budget_risk(p, up):
+    return simulate_budget_risk(up["budget"], p["budget"], p["primary_dest"], p["month"], _total_activities(up["itinerary"]))
+
+def _run_swaps(p, up):
+    itinerary, swaps = up["itinerary"], []
+    if up["budget"].get('score', 100) < 80:
+        itinerary, swaps = optimize_budget_swaps(itinerary, p["budget"], 2000 if p["travel_type"] == "Budget" else 4000, p["primary_dest"])
+    return {"itinerary": itinerary, "swaps": swaps}
+
+def _budget_data(budget, swaps):
+    budget_data = dict(budget)
+    if swaps: budget_data['status'] = "Optimized Match"
+    return budget_data
+
+def _run_risks(p, up):
+    risks = estimate_risk_factors(p["primary_dest"], p["month"])
+    return {"risks": risks, "risk_score": calculate_risk_score(risks)}
+
+def _run_experience(p, up):
+    return calculate_experience_score(up["swaps"]["itinerary"], p["interests"], p["primary_dest"], p["group_type"])
+
+def _run_time(p, up):
+    return calculate_time_efficiency(up["swaps"]["itinerary"], p["group_type"])
+
+def _run_summary(p, up):
+    sw, risks = up["swaps"], up["risks"]
+    budget_data = _budget_data(up["budget"], sw["swaps"])
+    overall = calculate_overall_score(budget_data['score'], up["experience"][0], up["time"][0], risks["risk_score"])
+    indicators = calculate_risk_indicators(p["budget"], budget_data, p["month"], sw["itinerary"], up["time"][3],
+                                           p["group_type"], p["pace"], p["students"], p["staff"], up["budget_risk"])
+    return {"overall": overall, "indicators": indicators}
+
+RUNNERS = {
+    "itinerary": _run_itinerary,
+    "budget": _run_budget,
+    "budget_risk": _run_budget_risk,
+    "swaps": _run_swaps,
+    "risks": _run_risks,
+    "experience": _run_experience,
+    "time": _run_time,
+    "summary": _run_summary,
+}
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)): return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict): return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+def run_strategy(params, state=None, force=()):
+    """Run the pipeline, reusing stage outputs from `state` whose inputs are unchanged.
+
+    params: destinations (list), interests, pace, days, group_type, travel_type,
+        month, budget, students, staff, drivers. primary_dest defaults to destinations[0].
+    state: the dict returned by a previous call (e.g. kept in st.session_state).
+    force: stage names to recompute regardless (e.g. ("itinerary",) to reshuffle).
+    Returns (results, state, recomputed_stage_names).
+    """
+    p = {"students": 0, "staff": 0, "drivers": 0, **params}
+    p.setdefault("primary_dest", p["destinations"][0])
+    state = state if state is not None else {}
+    outputs, recomputed = {}, []
+
+    for stage, (param_names, upstream) in STAGES.items():
+        entry = state.get(stage)
+        key = (tuple(_freeze(p[n]) for n in param_names), tuple(state[u]["version"] for u in upstream))
+        if entry is not None and entry["key"] == key and stage not in force:
+            count("stage_reused")
+            outputs[stage] = entry["output"]
+            continue
+
+        with span(f"stage.{stage}"):
+            # Runners get copies so cached upstream outputs are never mutated downstream
+            output = RUNNERS[stage](p, {u: copy.deepcopy(outputs[u]) if u == "itinerary" else outputs[u] for u in upstream})
+        recomputed.append(stage)
+        # Keep the old version when the output is unchanged so downstream stages stay valid
+        version = entry["version"] if entry is not None and entry["output"] == output else (entry["version"] + 1 if entry else 0)
+        state[stage] = {"key": key, "output": output, "version": version}
+        outputs[stage] = output
+
+    sw = outputs["swaps"]
+    exp_score, exp_status, exp_color = outputs["experience"]
+    time_score, time_status, time_color, avg_h = outputs["time"]
+    results = {
+        "itinerary": sw["itinerary"],
+        "budget_data": _budget_data(outputs["budget"], sw["swaps"]),
+        "swaps": sw["swaps"],
+        "budget_risk": outputs["budget_risk"],
+        "total_activities": _total_activities(outputs["itinerary"]),
+        "risks": outputs["risks"]["risks"],
+        "risk_score": outputs["risks"]["risk_score"],
+        "exp_score": exp_score, "exp_status": exp_status, "exp_color": exp_color,
+        "time_score": time_score, "time_status": time_status, "time_color": time_color, "avg_h": avg_h,
+        "overall": outputs["summary"]["overall"],
+        "indicators": outputs["summary"]["indicators"],
+    }
+    return results, state, recomputed
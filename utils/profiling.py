@@ -0,0 +1,91 @@
+"""Lightweight instrumentation for the strategy pipeline.
+
+Spans (context manager / decorator) aggregate wall time per stage; counters
+track DataFrame scans, haversine calls and cache hits. Everything is a no-op
+unless VOYAGEIQ_PROFILE=1 (or enable() is called).
+
+    VOYAGEIQ_PROFILE=1 streamlit run app.py     # then open ?debug=1
+"""
+import functools
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("voyageiq.profile")
+
+ENABLED = os.environ.get("VOYAGEIQ_PROFILE", "").lower() in ("1", "true", "yes")
+LOG_SPANS = os.environ.get("VOYAGEIQ_PROFILE_LOG", "").lower() in ("1", "true", "yes")
+
+_SPANS = {}      # name -> [calls, total_s, max_s]
+_COUNTERS = {}   # name -> int
+_STACK = []
+
+def enable(flag=True):
+    global ENABLED
+    ENABLED = flag
+
+def reset():
+    _SPANS.clear()
+    _COUNTERS.clear()
+    _STACK.clear()
+
+def count(name, n=1):
+    if ENABLED:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+@contextmanager
+def span(name):
+    if not ENABLED:
+        yield
+        return
+    _STACK.append(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _STACK.pop()
+        stats = _SPANS.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        if LOG_SPANS:
+            logger.info(json.dumps({"event": "span", "name": name, "ms": round(elapsed * 1000, 3), "parent": _STACK[-1] if _STACK else None}))
+
+def traced(name=None):
+    def decorator(fn):
+        span_name = name or fn.__name__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def snapshot():
+    return {
+        "spans": {k: {"calls": v[0], "total_ms": round(v[1] * 1000, 3), "max_ms": round(v[2] * 1000, 3)} for k, v in _SPANS.items()},
+        "counters": dict(_COUNTERS),
+    }
+
+def log_snapshot(level=logging.INFO):
+    logger.log(level, json.dumps({"event": "profile", **snapshot()}))
+
+def export_prometheus(prefix="voyageiq"):
+    lines = [
+        f"# HELP {prefix}_span_seconds_total Wall time spent in each pipeline stage.",
+        f"# TYPE {prefix}_span_seconds_total counter",
+    ]
+    for name, (calls, total, _) in sorted(_SPANS.items()):
+        lines.append(f'{prefix}_span_seconds_total{{stage="{name}"}} {total:.6f}')
+    lines += [f"# HELP {prefix}_span_calls_total Calls per pipeline stage.", f"# TYPE {prefix}_span_calls_total counter"]
+    for name, (calls, _, _) in sorted(_SPANS.items()):
+        lines.append(f'{prefix}_span_calls_total{{stage="{name}"}} {calls}')
+    lines += [f"# HELP {prefix}_events_total Instrumented event counters.", f"# TYPE {prefix}_events_total counter"]
+    for name, value in sorted(_COUNTERS.items()):
+        lines.append(f'{prefix}_events_total{{event="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,286 @@
+"""Shared-memory catalogue for multi-worker deployments.
+
+One process publishes the catalogue frames (ATTRACTIONS, HOTELS, VEHICLES,
+SEASONALITY) and derived numeric indexes into a single block; workers attach
+read-only instead of parsing the JSON/CSV files and rebuilding the indexes.
+Numeric columns and indexes are zero-copy views into the block. String and
+list columns are dictionary-encoded (int32 codes + one table of unique values)
+and decoded once per worker.
+
+The block is either a multiprocessing.shared_memory segment (owned by the
+publishing process, e.g. api_server.py) or a file that is memory-mapped, so
+independent Streamlit processes can share it:
+
+    python -m utils.shared_catalog publish /dev/shm/voyageiq.cat
+    VOYAGEIQ_SHARED_CATALOG=/dev/shm/voyageiq.cat streamlit run app.py
+
+Memory benchmark (N workers, private load vs attach):
+
+    python -m utils.shared_catalog bench --workers 4 --attractions 200000
+"""
+import argparse
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from multiprocessing import get_context, resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"VIQCAT01"
+ALIGN = 64
+_HEADER = struct.Struct("<8sQ")
+
+# Blocks attached by this process; kept alive for as long as the frames are in use
+_ATTACHED = []
+
+def _encode_column(series):
+    values = series.to_numpy()
+    if values.dtype.kind in "biuf" and not isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        return {"kind": "array"}, values
+    # Strings, tag lists: codes into a table of unique values (lists are hashed as tuples)
+    table, codes = {}, np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        key = tuple(v) if isinstance(v, list) else v
+        codes[i] = table.setdefault(key, len(table))
+    uniques = list(table)
+    return {"kind": "dict", "pandas_dtype": str(series.dtype), "lists": any(isinstance(v, list) for v in values), "uniques": uniques}, codes
+
+def _decode_column(meta, arr):
+    if meta["kind"] == "array":
+        return arr
+    uniques = meta["uniques"]
+    if meta["lists"]:
+        uniques = [list(u) if isinstance(u, tuple) else u for u in uniques]
+    out = np.empty(len(uniques), dtype=object)
+    out[:] = uniques
+    values = out[arr]
+    return values if meta["pandas_dtype"] == "object" else pd.array(values, dtype=pd.api.types.pandas_dtype(meta["pandas_dtype"]))
+
+def _layout(frames, arrays):
+    """Manifest (JSON), object tables (pickle) and the ordered list of arrays to write."""
+    manifest, tables, blobs = {"frames": {}, "arrays": {}}, {}, []
+
+    def add(arr):
+        arr = np.ascontiguousarray(arr)
+        blobs.append(arr)
+        return {"dtype": arr.dtype.str, "shape": list(arr.shape), "slot": len(blobs) - 1}
+
+    for name, df in frames.items():
+        cols = []
+        for col in df.columns:
+            meta, arr = _encode_column(df[col])
+            if meta["kind"] == "dict":
+                tables[(name, col)] = meta.pop("uniques")
+            cols.append({"name": col, **meta, **add(arr)})
+        idx = df.index
+        if isinstance(idx, pd.RangeIndex):
+            index = {"range": [idx.start, idx.stop, idx.step]}
+        else:
+            index = add(idx.to_numpy())
+        manifest["frames"][name] = {"columns": cols, "index": index}
+    for name, arr in arrays.items():
+        manifest["arrays"][name] = add(arr)
+    return manifest, pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL), blobs
+
+def _align(n):
+    return -(-n // ALIGN) * ALIGN
+
+def _pack(frames, arrays):
+    manifest, tables, blobs = _layout(frames, arrays)
+    offsets, pos = [], 0
+    for arr in blobs:
+        pos = _align(pos)
+        offsets.append(pos)
+        pos += arr.nbytes
+    manifest["offsets"], manifest["tables_len"] = offsets, len(tables)
+    head = json.dumps(manifest).encode()
+    data_start = _align(_HEADER.size + len(head) + len(tables))
+    return head, tables, blobs, data_start, data_start + pos
+
+def _write(buf, head, tables, blobs, data_start):
+    _HEADER.pack_into(buf, 0, MAGIC, len(head))
+    start = _HEADER.size
+    buf[start:start + len(head)] = head
+    buf[start + len(head):start + len(head) + len(tables)] = tables
+    for arr, off in zip(blobs, json.loads(head)["offsets"]):
+        dst = np.ndarray(arr.shape, dtype=arr.dtype, buffer=buf, offset=data_start + off)
+        dst[...] = arr
+
+class SharedCatalog:
+    """Handle for a published block. The publisher must keep it alive while workers run."""
+
+    def __init__(self, name, shm=None):
+        self.name = name
+        self._shm = shm
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self):
+        if self._shm is not None:
+            self._shm.unlink()
+        elif os.path.exists(self.name):
+            os.remove(self.name)
+
+def publish(frames, arrays=None, path=None):
+    """Write frames (name -> DataFrame) and arrays (name -> ndarray) to shared memory or `path`."""
+    head, tables, blobs, data_start, size = _pack(frames, arrays or {})
+    if path:
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(size)
+        with open(tmp, "r+b") as f, mmap.mmap(f.fileno(), size) as buf:
+            _write(buf, head, tables, blobs, data_start)
+        os.replace(tmp, path)
+        return SharedCatalog(path)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    _write(shm.buf, head, tables, blobs, data_start)
+    return SharedCatalog(shm.name, shm)
+
+def _open_untracked(name):
+    # Attaching must not register the segment: the resource tracker would unlink it when this worker exits
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+def attach(name):
+    """Attach to a published block (file path or shared-memory name). Returns (frames, arrays)."""
+    if os.path.exists(name):
+        with open(name, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        keep = buf
+    else:
+        shm = _open_untracked(name)
+        buf, keep = shm.buf, shm
+    _ATTACHED.append(keep)
+
+    magic, head_len = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{name} is not a VoyageIQ catalogue block")
+    start = _HEADER.size
+    manifest = json.loads(bytes(buf[start:start + head_len]))
+    tables = pickle.loads(bytes(buf[start + head_len:start + head_len + manifest["tables_len"]]))
+    data_start = _align(start + head_len + manifest["tables_len"])
+
+    def view(meta):
+        arr = np.ndarray(tuple(meta["shape"]), dtype=np.dtype(meta["dtype"]), buffer=buf,
+                         offset=data_start + manifest["offsets"][meta["slot"]])
+        arr.flags.writeable = False
+        return arr
+
+    frames = {}
+    for name_, spec in manifest["frames"].items():
+        data = {}
+        for col in spec["columns"]:
+            if col["kind"] == "dict":
+                col = {**col, "uniques": tables[(name_, col["name"])]}
+            data[col["name"]] = _decode_column(col, view(col))
+        index = pd.RangeIndex(*spec["index"]["range"]) if "range" in spec["index"] else pd.Index(view(spec["index"]))
+        frames[name_] = pd.DataFrame(data, index=index, copy=False)
+    arrays = {k: view(meta) for k, meta in manifest["arrays"].items()}
+    return frames, arrays
+
+def publish_catalogue(path=None):
+    """Publish the catalogue utils.analysis has loaded, with its per-city indexes."""
+    from utils import analysis
+    frames = {"ATTRACTIONS": analysis.ATTRACTIONS, "HOTELS": analysis.HOTELS,
+              "VEHICLES": analysis.VEHICLES, "SEASONALITY": analysis.SEASONALITY}
+    return publish(frames, analysis.catalogue_indexes(analysis.ATTRACTIONS), path=path)
+
+# --- MEMORY BENCHMARK ---
+def _memory_kb():
+    # PSS splits shared pages between the processes mapping them, so it sums to real usage
+    stats = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key = line.split(":")[0]
+                if key in ("Rss", "Pss"): stats[key.lower()] = int(line.split()[1])
+    except OSError:  # not Linux
+        pass
+    return stats
+
+def _bench_worker(mode, source, barrier, results):
+    from utils import analysis
+    before = _memory_kb()
+    start = time.perf_counter()
+    if mode == "shared":
+        frames, arrays = attach(source)
+    else:
+        frames = dict(zip(("ATTRACTIONS", "HOTELS", "VEHICLES", "SEASONALITY"), analysis.load_data(source)))
+        arrays = analysis.catalogue_indexes(frames["ATTRACTIONS"])
+    # Touch every column and index so pages are actually mapped
+    checksum = sum(float(df.select_dtypes("number").to_numpy().sum()) for df in frames.values())
+    checksum += sum(float(a.sum()) for a in arrays.values())
+    elapsed = time.perf_counter() - start
+    after = _memory_kb()
+    barrier.wait()  # every worker holds its copy while the others measure
+    results.put({"mode": mode, "load_ms": elapsed * 1000, "checksum": checksum,
+                 "rss_kb": after.get("rss", 0) - before.get("rss", 0), "pss_kb": after.get("pss", 0)})
+    barrier.wait()
+
+def run_memory_benchmark(data_dir, workers=4):
+    from utils import analysis
+    ctx = get_context("spawn")
+    frames = dict(zip(("ATTRACTIONS", "HOTELS", "VEHICLES", "SEASONALITY"), analysis.load_data(data_dir)))
+    handle = publish(frames, analysis.catalogue_indexes(frames["ATTRACTIONS"]))
+    report = {}
+    try:
+        for mode, source in (("private", data_dir), ("shared", handle.name)):
+            barrier, results = ctx.Barrier(workers), ctx.Queue()
+            procs = [ctx.Process(target=_bench_worker, args=(mode, source, barrier, results)) for _ in range(workers)]
+            for p in procs: p.start()
+            rows = [results.get() for _ in procs]
+            for p in procs: p.join()
+            report[mode] = {
+                "workers": workers,
+                "load_ms_mean": round(sum(r["load_ms"] for r in rows) / workers, 1),
+                "rss_delta_kb_mean": round(sum(r["rss_kb"] for r in rows) / workers),
+                "pss_kb_total": sum(r["pss_kb"] for r in rows),
+            }
+    finally:
+        handle.close()
+        handle.unlink()
+    return report
+
+def _bench_data_dir(workdir, n_attractions, n_cities):
+    from utils.generate_synthetic_data import generate_all
+    generate_all(workdir, n_attractions, n_cities, hotels_per_city=5)
+    return workdir
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish or benchmark the shared VoyageIQ catalogue")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    pub = sub.add_parser("publish", help="Write the catalogue to a memory-mapped file")
+    pub.add_argument("path")
+    bench = sub.add_parser("bench", help="Compare N workers loading privately vs attaching")
+    bench.add_argument("--workers", type=int, default=4)
+    bench.add_argument("--attractions", type=int, default=100_000)
+    bench.add_argument("--cities", type=int, default=2_000)
+    args = parser.parse_args()
+
+    if args.cmd == "publish":
+        publish_catalogue(args.path)
+        print(f"Published catalogue to {args.path} ({os.path.getsize(args.path) / 1024:.1f} KiB)")
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        report = run_memory_benchmark(_bench_data_dir(workdir, args.attractions, args.cities), args.workers)
+    for mode, r in report.items():
+        print(f"{mode:<8} workers={r['workers']} load={r['load_ms_mean']:>8.1f} ms  "
+              f"rss+={r['rss_delta_kb_mean'] / 1024:>7.1f} MiB/worker  pss total={r['pss_kb_total'] / 1024:>7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
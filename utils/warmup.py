@@ -0,0 +1,239 @@
+"""Warm-up for the per-destination caches in utils/analysis.py.
+
+After a deploy the first request for each city pays for its pool scan,
+distance matrix and k-means day clusters. warm_all() builds every one of them
+up front (global tables first, then destinations in parallel threads) and
+reports build time and memory per destination. save()/load() persist the
+artefacts as a pickle keyed by a fingerprint of the loaded catalogue, so a
+restart on unchanged data just loads them; a stale file is ignored.
+
+    python -m utils.warmup                                  # build and report
+    python -m utils.warmup --cache /var/cache/voyageiq.pkl  # reuse the file if fresh, else build and save it
+
+The Streamlit app and the API workers warm up at startup when
+VOYAGEIQ_WARMUP is set: "1" warms in memory, any other value is a cache path.
+Only load cache files this service wrote; they are unpickled.
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import analysis
+
+WARMUP_VERSION = 1
+WARMUP_ENV = "VOYAGEIQ_WARMUP"
+# A distance matrix is 8 * n^2 bytes; bigger pools (large states) keep building theirs on demand
+MAX_DIST_POIS = 1500
+GLOBAL_KINDS = ("place_index", "city_stats", "risk_index", "attraction_ids")
+CITY_KINDS = ("city_rows", "pool", "dist", "clusters")
+# Pools are rebuilt from the catalogue on load (one groupby beats unpickling thousands of frames)
+PERSIST_KINDS = GLOBAL_KINDS + ("dist", "clusters")
+
+# --- SIZING ---
+def artefact_bytes(value):
+    # Approximate deep size; arrays attached from a shared catalogue count in full
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(artefact_bytes(k) + artefact_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        if all(type(v) is int for v in value):  # neighbour lists; small ints are cached singletons
+            return sys.getsizeof(value)
+        return sys.getsizeof(value) + sum(artefact_bytes(v) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + artefact_bytes(vars(value))
+    return sys.getsizeof(value)
+
+# --- BUILD ---
+def destinations():
+    # Every name a pool can be built for: catalogue cities, then states that aren't also cities
+    cities = list(analysis.ATTRACTIONS['city'].unique())
+    known = set(cities)
+    return cities + [s for s in analysis.ATTRACTIONS['state'].unique() if s not in known]
+
+def warm_pools(names=None):
+    # One groupby instead of a full-table scan per city; the rows and index match _rows(ATTRACTIONS, 'city', c),
+    # and city_rows shares the pool frame. States (and anything else) go through destination_pool.
+    frame = analysis.ATTRACTIONS
+    entries = {}
+    for city, positions in frame.groupby('city', sort=False).indices.items():
+        rows = frame.iloc[positions]
+        entries[("pool", city)] = entries[("city_rows", city)] = rows
+    analysis.restore_caches(entries)
+    for name in destinations() if names is None else names:
+        analysis.destination_pool(name)
+
+def cluster_counts(pool_size):
+    # generate_itinerary uses k = min(MAX_DAY_CLUSTERS, len(filtered pool) // target_count). Warm the k of an
+    # unfiltered pool for every pace/group target; interest-filtered pools give smaller k's, built on demand.
+    targets = {max(1, spec["density"] - d) for spec in analysis.GROUP_INTELLIGENCE_SPECS.values() for d in (0, 1)}
+    return sorted({max(1, min(analysis.MAX_DAY_CLUSTERS, pool_size // t)) for t in targets})
+
+def warm_globals():
+    builders = {
+        "place_index": analysis.place_index,
+        "city_stats": analysis.city_stats_table,
+        "risk_index": analysis.risk_index,
+        "attraction_ids": analysis.attraction_ids,
+    }
+    report = {}
+    for kind, build in builders.items():
+        start = time.perf_counter()
+        value = build()
+        report[kind] = {"ms": (time.perf_counter() - start) * 1000, "kib": artefact_bytes(value) / 1024}
+    return report
+
+def warm_destination(name, max_dist_pois=MAX_DIST_POIS):
+    start = time.perf_counter()
+    pool = analysis.destination_pool(name)
+    built = [pool]
+    if analysis.city_stats(name) is not None:
+        built.append(analysis.city_rows(name))
+    if not pool.empty:
+        if len(pool) <= max_dist_pois:
+            built.append(analysis.destination_distance_matrix(name))
+        for k in cluster_counts(len(pool)):
+            built.append(analysis.geo_clusters(name, k))
+    elapsed = (time.perf_counter() - start) * 1000
+    # city_rows and pool can be the same frame
+    size = sum(artefact_bytes(v) for v in {id(v): v for v in built}.values())
+    return {"name": name, "pois": len(pool), "artefacts": len(built), "ms": elapsed, "kib": size / 1024}
+
+def warm_all(workers=None, names=None, max_dist_pois=MAX_DIST_POIS):
+    """Build every global and per-destination artefact; returns a timing/memory report.
+
+    Destinations run on a thread pool (the heavy parts are NumPy/pandas); the
+    global tables are built first because every destination lookup uses them.
+    """
+    start = time.perf_counter()
+    report = {"globals": warm_globals()}
+    names = destinations() if names is None else names
+    start_pools = time.perf_counter()
+    warm_pools(names)
+    report["pools_ms"] = (time.perf_counter() - start_pools) * 1000
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        cities = list(pool.map(lambda n: warm_destination(n, max_dist_pois), names))
+    report["destinations"] = cities
+    report["wall_ms"] = (time.perf_counter() - start) * 1000
+    report["kib"] = sum(g["kib"] for g in report["globals"].values()) + sum(c["kib"] for c in cities)
+    return report
+
+# --- PERSISTENCE ---
+def catalogue_fingerprint():
+    # Content hash of the loaded frames, so a private load and a shared-catalogue attach agree
+    h = hashlib.md5(f"v{WARMUP_VERSION}|pandas {pd.__version__}|numpy {np.__version__}".encode())
+    frames = {"ATTRACTIONS": analysis.ATTRACTIONS, "HOTELS": analysis.HOTELS, "VEHICLES": analysis.VEHICLES,
+              "SEASONALITY": analysis.SEASONALITY, "RISK_CALENDAR": analysis.RISK_CALENDAR}
+    for name, df in frames.items():
+        h.update(f"{name}:{len(df)}:{','.join(map(str, df.columns))}".encode())
+        for col in df.columns:
+            h.update(pd.util.hash_pandas_object(df[col].astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+def _encode(cache_key, value):
+    # Cluster label Series pickle slowly; store plain arrays and rebuild on load
+    if cache_key[0] == "clusters":
+        labels, neighbours = value
+        return labels.to_numpy(), labels.index.to_numpy(), neighbours
+    return value
+
+def _decode(cache_key, value):
+    if cache_key[0] == "clusters":
+        labels, index, neighbours = value
+        return pd.Series(labels, index=pd.Index(index)), neighbours
+    return value
+
+def save(path, fingerprint=None):
+    entries = {k: _encode(k, v) for k, v in analysis.export_caches(PERSIST_KINDS).items()}
+    payload = {"version": WARMUP_VERSION, "fingerprint": fingerprint or catalogue_fingerprint(), "entries": entries}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # Write then rename: workers warming up together never read a half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return len(entries)
+
+def load(path, fingerprint=None):
+    """Seed the caches from `path` and rebuild the pools; None when the file is missing, unreadable or for other data."""
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if payload.get("version") != WARMUP_VERSION or payload.get("fingerprint") != (fingerprint or catalogue_fingerprint()):
+        return None
+    restored = analysis.restore_caches({k: _decode(k, v) for k, v in payload["entries"].items()})
+    warm_pools()
+    return restored
+
+def warm_start(path=None, workers=None, rebuild=False):
+    """Load persisted artefacts when fresh, otherwise build them (and save when `path` is given)."""
+    start = time.perf_counter()
+    fingerprint = catalogue_fingerprint() if path else None
+    if path and not rebuild and load(path, fingerprint) is not None:
+        return {"source": "disk", "path": path, "artefacts": len(analysis.export_caches(GLOBAL_KINDS + CITY_KINDS)),
+                "ms": (time.perf_counter() - start) * 1000}
+    report = warm_all(workers)
+    summary = {"source": "built", "path": path, "report": report,
+               "artefacts": len(analysis.export_caches(GLOBAL_KINDS + CITY_KINDS))}
+    if path:
+        save(path, fingerprint)
+    summary["ms"] = (time.perf_counter() - start) * 1000
+    return summary
+
+def warmup_path_from_env():
+    # (enabled, cache path or None)
+    value = os.environ.get(WARMUP_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return False, None
+    return True, None if value.lower() in ("1", "true", "yes") else value
+
+# --- CLI ---
+def main():
+    parser = argparse.ArgumentParser(description="Pre-build every per-destination artefact and report time and memory")
+    parser.add_argument("--cache", default=None, help="Pickle file to reuse when fresh, else to write")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore an existing --cache file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--data-dir", default=None, help="Warm a catalogue directory instead of the default data/")
+    parser.add_argument("--top", type=int, default=15, help="Destinations to list, slowest first")
+    args = parser.parse_args()
+
+    if args.data_dir:
+        analysis.ATTRACTIONS, analysis.HOTELS, analysis.VEHICLES, analysis.SEASONALITY = analysis.load_data(args.data_dir)
+        analysis.RISK_CALENDAR = analysis.load_risk_calendar(args.data_dir)
+        analysis.reset_caches()
+
+    summary = warm_start(args.cache, args.workers, args.rebuild)
+    if summary["source"] == "disk":
+        print(f"Loaded {summary['artefacts']:,} artefacts from {summary['path']} in {summary['ms']:.1f} ms")
+        return
+
+    report = summary["report"]
+    for kind, g in report["globals"].items():
+        print(f"{kind:<32} {g['ms']:>10.1f} ms {g['kib']:>12.1f} KiB")
+    print(f"{'pools':<32} {report['pools_ms']:>10.1f} ms")
+    cities = sorted(report["destinations"], key=lambda c: c["ms"], reverse=True)
+    print(f"\n{'destination':<32} {'pois':>6} {'artefacts':>9} {'ms':>10} {'KiB':>12}")
+    for c in cities[:args.top]:
+        print(f"{c['name']:<32} {c['pois']:>6} {c['artefacts']:>9} {c['ms']:>10.1f} {c['kib']:>12.1f}")
+    if len(cities) > args.top:
+        print(f"... {len(cities) - args.top} more")
+    print(f"\nWarmed {len(cities):,} destinations ({summary['artefacts']:,} artefacts, "
+          f"{report['kib'] / 1024:.1f} MiB) in {report['wall_ms']:.0f} ms with {args.workers} thread(s)")
+    if args.cache:
+        print(f"Saved to {args.cache} ({os.path.getsize(args.cache) / 1024:.1f} KiB)")
+
+if __name__ == "__main__":
+    main()